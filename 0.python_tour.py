@@ -379,4 +379,139 @@ except ValueError as exc:
     print(exc)
 else:
     # Successfull run of try-block
-    print(f"You gave {user_age} as your age.")
\ No newline at end of file
+    print(f"You gave {user_age} as your age.")
+
+##############################
+#### STREAMING AGGREGATES ####
+##############################
+# When there are too many key-value pairs to keep in a dictionary, you can
+# still summarize them as they stream past. Running totals like the sum,
+# minimum and maximum only need a few variables. The biggest keys can be
+# estimated with the "space-saving" algorithm, which keeps a fixed number of
+# counters: when a new key arrives and every counter is taken, it replaces
+# the smallest counter and remembers that its count may be too high by that
+# much.
+
+# A streaming aggregator
+class StreamingAggregate:
+    """Summarize (key, value) pairs in a bounded amount of memory."""
+
+    def __init__(self, top_k=10):
+        """Start with no pairs seen."""
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        # key -> [estimated total, maximum overestimate]
+        self.top_k = top_k
+        self.counters = {}
+        # The biggest estimate ever dropped; a key that isn't counted can't
+        # have a bigger total than this.
+        self.evicted = 0
+
+    def add(self, key, value):
+        """Add one (key, value) pair."""
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+        if key in self.counters:
+            self.counters[key][0] += value
+        elif len(self.counters) < self.top_k:
+            self.counters[key] = [value, 0]
+        else:
+            smallest = min(self.counters, key=lambda k: self.counters[k][0])
+            estimate = self.counters.pop(smallest)[0]
+            # After a merge, the new key may already have up to
+            # self.evicted, which can be more than the smallest counter.
+            self.evicted = max(self.evicted, estimate)
+            self.counters[key] = [self.evicted + value, self.evicted]
+
+    def consume(self, pairs):
+        """Add every pair from an iterator, and return the aggregate."""
+        for key, value in pairs:
+            self.add(key, value)
+        return self
+
+    def snapshots(self, pairs, every=1000000):
+        """Add pairs from an iterator, yielding a snapshot after every
+        'every' pairs and after the last pair."""
+        for key, value in pairs:
+            self.add(key, value)
+            if self.count % every == 0:
+                yield self.snapshot()
+        if self.count % every:
+            yield self.snapshot()
+
+    def mean(self):
+        """Return the mean value, or None if nothing was added."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def top(self, k=None):
+        """Return the biggest keys as (key, estimated total, error)."""
+        ranked = sorted(self.counters.items(), key=lambda item: -item[1][0])
+        return [(key, total, error) for key, (total, error) in ranked[:k]]
+
+    def snapshot(self):
+        """Return the current results as a dictionary."""
+        return {'count': self.count, 'sum': self.total,
+                'min': self.minimum, 'max': self.maximum,
+                'mean': self.mean(), 'top': self.top()}
+
+    def merge(self, other):
+        """Combine the results of another aggregator into this one."""
+        self.count += other.count
+        self.total += other.total
+        for value in other.minimum, other.maximum:
+            if value is not None:
+                if self.minimum is None or value < self.minimum:
+                    self.minimum = value
+                if self.maximum is None or value > self.maximum:
+                    self.maximum = value
+
+        # A key missing from one side may have had up to the biggest
+        # estimate that side dropped, so add that to its count and its
+        # error. A side that never dropped a key saw every key it counts.
+        own_floor = self.evicted
+        other_floor = other.evicted
+        merged = {}
+        for key in self.counters.keys() | other.counters.keys():
+            total, error = self.counters.get(key, (own_floor, own_floor))
+            other_total, other_error = other.counters.get(
+                key, (other_floor, other_floor))
+            merged[key] = [total + other_total, error + other_error]
+        ranked = sorted(merged.items(), key=lambda item: -item[1][0])
+        self.counters = dict(ranked[:self.top_k])
+        # A dropped key may have been seen on both sides.
+        self.evicted = own_floor + other_floor
+        if len(ranked) > self.top_k:
+            self.evicted = max(self.evicted, ranked[self.top_k][1][0])
+        return self
+
+# Summarizing the demography pairs
+demography = {'mozambique': 30, 'angola': 32, 'south africa': 59}
+
+aggregate = StreamingAggregate(top_k=2)
+aggregate.consume(demography.items())
+print(aggregate.snapshot())
+
+# Merging the results of parallel workers
+# Each worker summarizes part of the stream, and the results are merged.
+rows = [('mozambique', 30), ('angola', 32), ('south africa', 59),
+        ('tanzania', 61), ('mozambique', 1), ('angola', 2)]
+
+first_half = StreamingAggregate(top_k=3).consume(rows[:3])
+second_half = StreamingAggregate(top_k=3).consume(rows[3:])
+first_half.merge(second_half)
+print(first_half.top())
+
+# Taking snapshots while the pairs stream past
+for snapshot in StreamingAggregate().snapshots(iter(rows), every=2):
+    print(snapshot['count'], snapshot['mean'])
\ No newline at end of file
@@ -375,4 +375,1504 @@ for old_dog in old_dogs:
 
 del dogs[0]
 dogs.remove('peso')
-print(dogs)
\ No newline at end of file
+print(dogs)
+
+######################################################################################
+#### Statistics in a single pass ####
+######################################################################################
+# Calling min(), max() and sum() separately loops through the list three
+# times. A single loop can keep track of all of them at once, and Welford's
+# method updates the mean and the variance as each value arrives without
+# storing the values. When NumPy is installed, large numeric buffers are
+# handed to it instead, because it does the same work in compiled code. Data
+# that doesn't fit in memory can be read and summarized one chunk at a time.
+
+# ==> A statistics module (save this as stats.py) <==
+import math
+import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Buffers with at least this many values use NumPy when it's available.
+NUMPY_THRESHOLD = 10000
+
+
+class RunningStats():
+    """Keep the count, min, max, mean and variance of a stream of values."""
+
+    def __init__(self):
+        """Start with no values."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0   # sum of squared differences from the mean
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value):
+        """Add one value using Welford's method."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def update(self, values):
+        """Add every value from an iterable."""
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        """Combine the statistics of another RunningStats into this one."""
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    @classmethod
+    def from_numpy(cls, values):
+        """Summarize a NumPy array with vectorized operations."""
+        stats = cls()
+        stats.count = len(values)
+        if stats.count:
+            stats.mean = float(values.mean())
+            stats.m2 = float(values.var()) * stats.count
+            stats.minimum = float(values.min())
+            stats.maximum = float(values.max())
+        return stats
+
+    def variance(self):
+        """Return the population variance."""
+        return self.m2 / self.count if self.count else math.nan
+
+    def stdev(self):
+        """Return the population standard deviation."""
+        return math.sqrt(self.variance())
+
+    def summary(self):
+        """Return the statistics as a dictionary. Everything but the count
+        is nan when there are no values."""
+        if not self.count:
+            return {'count': 0, 'min': math.nan, 'max': math.nan,
+                    'mean': math.nan, 'variance': math.nan}
+        return {'count': self.count, 'min': self.minimum,
+                'max': self.maximum, 'mean': self.mean,
+                'variance': self.variance()}
+
+
+def quantile(sorted_values, q):
+    """Return the q quantile of sorted values, interpolating between the
+    two nearest values."""
+    position = q * (len(sorted_values) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return (sorted_values[lower] * (1 - fraction)
+            + sorted_values[upper] * fraction)
+
+
+def as_numpy(values):
+    """Return values as a NumPy array if that's worth doing, or None."""
+    if np is None:
+        return None
+    if isinstance(values, np.ndarray):
+        return values
+    if (isinstance(values, (array, memoryview))
+            and len(values) >= NUMPY_THRESHOLD):
+        return np.frombuffer(values, dtype=values.typecode
+                             if isinstance(values, array) else values.format)
+    return None
+
+
+def describe(values, quantiles=(0.25, 0.5, 0.75)):
+    """Return count, min, max, mean, variance and quantiles of values,
+    looping through them only once."""
+    buffer = as_numpy(values)
+    if buffer is not None:
+        summary = RunningStats.from_numpy(buffer).summary()
+        if len(buffer):
+            summary['quantiles'] = [float(value) for value in
+                                    np.quantile(buffer, quantiles)]
+        else:
+            summary['quantiles'] = [math.nan for q in quantiles]
+        return summary
+
+    # Keep a compact copy of the values for the quantiles as we go.
+    stats = RunningStats()
+    seen = array('d')
+    for value in values:
+        stats.add(value)
+        seen.append(value)
+
+    summary = stats.summary()
+    ordered = sorted(seen)
+    summary['quantiles'] = [quantile(ordered, q) if ordered else math.nan
+                            for q in quantiles]
+    return summary
+
+
+def read_chunks(filename, chunk_size=1000000):
+    """Yield arrays of doubles from a binary file, one chunk at a time."""
+    with open(filename, 'rb') as file_object:
+        while True:
+            chunk = array('d')
+            try:
+                chunk.fromfile(file_object, chunk_size)
+            except EOFError:
+                # fromfile() keeps the values it read before the end.
+                pass
+            if not chunk:
+                return
+            yield chunk
+
+
+def random_open():
+    """Return a random number strictly between 0 and 1."""
+    value = random.random()
+    while not value:
+        value = random.random()
+    return value
+
+
+def skip_length(log_w):
+    """Return how many values to skip before the next one to sample, given
+    the log of Algorithm L's weight."""
+    # -expm1(log_w) is 1 - weight, without rounding to 0 for tiny steps.
+    return math.floor(math.log(random_open()) / math.log(-math.expm1(log_w)))
+
+
+def describe_chunks(chunks, quantiles=(0.25, 0.5, 0.75),
+                    sample_size=100000):
+    """Summarize data that's too big for memory, one chunk at a time.
+
+    The quantiles are estimated from a random sample of sample_size values,
+    so they're approximate for larger data sets.
+    """
+    if sample_size < 1:
+        raise ValueError("sample_size must be at least 1")
+    stats = RunningStats()
+    sample = array('d')
+    seen = 0
+    # Reservoir sampling keeps every value with the same chance. Instead of
+    # drawing a random number for every value, Li's "Algorithm L" draws how
+    # many values to skip before the next one that goes into the sample, so
+    # the work grows with the size of the sample, not the size of the data.
+    log_w = math.log(random_open()) / sample_size
+    next_index = sample_size + skip_length(log_w)
+    for chunk in chunks:
+        buffer = as_numpy(chunk)
+        if buffer is not None:
+            stats.merge(RunningStats.from_numpy(buffer))
+        else:
+            stats.merge(RunningStats().update(chunk))
+
+        if len(sample) < sample_size:
+            sample.extend(chunk[:sample_size - len(sample)])
+        while next_index < seen + len(chunk):
+            sample[random.randrange(sample_size)] = chunk[next_index - seen]
+            log_w += math.log(random_open()) / sample_size
+            next_index += 1 + skip_length(log_w)
+        seen += len(chunk)
+
+    summary = stats.summary()
+    ordered = sorted(sample)
+    summary['quantiles'] = [quantile(ordered, q) if ordered else math.nan
+                            for q in quantiles]
+    return summary
+
+# ==> Describing the heights <==
+# from stats import describe # uncomment this line
+heights = [1.2, 0.5, 1.0, 1.1, 0.4, 2.1, 1.9]
+summary = describe(heights)
+
+print("Shortest:", summary['min'])
+print("Tallest:", summary['max'])
+print("Average:", summary['mean'])
+print("Variance:", summary['variance'])
+print("Quartiles:", summary['quantiles'])
+
+# ==> Describing a file of heights one chunk at a time <==
+# from stats import read_chunks, describe_chunks # uncomment this line
+import os
+import tempfile
+
+filename = os.path.join(tempfile.gettempdir(), 'heights.bin')
+with open(filename, 'wb') as file_object:
+    array('d', (random.uniform(0.4, 2.1) for _ in range(300000))).tofile(
+        file_object)
+
+summary = describe_chunks(read_chunks(filename, chunk_size=100000))
+print(summary['count'], "heights, average", round(summary['mean'], 3))
+os.remove(filename)
+
+######################################################################################
+#### Keeping a list sorted ####
+######################################################################################
+# Calling artists.sort() after every change sorts the whole list again. If
+# the list is already sorted, the 'bisect' module can find where a new item
+# belongs by repeatedly halving the list, and insert it there. Inserting
+# into one huge list still has to shift every item after it, so a sorted list
+# can be stored as many short sorted sublists instead: each insert or remove
+# then only shifts items inside one short sublist. To find the item at a
+# position, the list keeps the position where each sublist starts, and
+# bisects those too. Changes throw the starting positions away, and they're
+# worked out again, one number per sublist, the next time they're needed.
+
+# ==> A sorted list made of sublists <==
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+
+class SortedList():
+    """A list that stays sorted as items are added and removed."""
+
+    # Sublists are split when they grow past twice this size.
+    load = 1000
+
+    def __init__(self, items=(), key=None):
+        """Make a sorted list, optionally ordered by key(item)."""
+        self.key = key
+        self.sublists = []
+        self.sublist_keys = []
+        self.maxes = []
+        self.offsets = []
+        self.length = 0
+        for item in sorted(items, key=key):
+            self.append_sorted(item)
+
+    def item_key(self, item):
+        """Return the value that item is sorted by."""
+        return item if self.key is None else self.key(item)
+
+    def append_sorted(self, item):
+        """Add an item that belongs at the end of the list."""
+        item_key = self.item_key(item)
+        if not self.sublists or len(self.sublists[-1]) >= self.load:
+            self.sublists.append([])
+            self.sublist_keys.append([])
+            self.maxes.append(item_key)
+        self.sublists[-1].append(item)
+        self.sublist_keys[-1].append(item_key)
+        self.maxes[-1] = item_key
+        self.length += 1
+        self.offsets = None
+
+    def add(self, item):
+        """Insert item in sorted order, after any equal items."""
+        item_key = self.item_key(item)
+        if not self.sublists:
+            self.append_sorted(item)
+            return
+
+        pos = min(bisect_right(self.maxes, item_key), len(self.maxes) - 1)
+        keys = self.sublist_keys[pos]
+        index = bisect_right(keys, item_key)
+        keys.insert(index, item_key)
+        self.sublists[pos].insert(index, item)
+        self.maxes[pos] = keys[-1]
+        self.length += 1
+        self.offsets = None
+
+        if len(keys) > 2 * self.load:
+            # Split a sublist that has grown too long.
+            half = len(keys) // 2
+            self.sublists[pos:pos + 1] = [self.sublists[pos][:half],
+                                          self.sublists[pos][half:]]
+            self.sublist_keys[pos:pos + 1] = [keys[:half], keys[half:]]
+            self.maxes[pos:pos + 1] = [keys[half - 1], keys[-1]]
+
+    def locate(self, item):
+        """Return the (sublist, index) of item, or None if it's missing."""
+        item_key = self.item_key(item)
+        pos = bisect_left(self.maxes, item_key)
+        while pos < len(self.maxes):
+            keys = self.sublist_keys[pos]
+            index = bisect_left(keys, item_key)
+            # Items with equal keys may not be equal, so check each one.
+            while index < len(keys) and keys[index] == item_key:
+                if self.sublists[pos][index] == item:
+                    return pos, index
+                index += 1
+            if index < len(keys):
+                return None
+            pos += 1
+        return None
+
+    def remove(self, item):
+        """Remove the first occurrence of item."""
+        found = self.locate(item)
+        if found is None:
+            raise ValueError(f"{item!r} is not in the list")
+        self.delete_at(*found)
+
+    def discard(self, item):
+        """Remove item if it's in the list."""
+        found = self.locate(item)
+        if found is not None:
+            self.delete_at(*found)
+
+    def delete_at(self, pos, index):
+        """Remove the item at an index in one sublist."""
+        del self.sublists[pos][index]
+        del self.sublist_keys[pos][index]
+        self.length -= 1
+        self.offsets = None
+        if self.sublists[pos]:
+            self.maxes[pos] = self.sublist_keys[pos][-1]
+        else:
+            del self.sublists[pos]
+            del self.sublist_keys[pos]
+            del self.maxes[pos]
+
+    def __contains__(self, item):
+        return self.locate(item) is not None
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for sublist in self.sublists:
+            yield from sublist
+
+    def __reversed__(self):
+        for sublist in reversed(self.sublists):
+            yield from reversed(sublist)
+
+    def sublist_offsets(self):
+        """Return the position of the first item of each sublist."""
+        if self.offsets is None:
+            self.offsets = list(accumulate(
+                (len(sublist) for sublist in self.sublists[:-1]), initial=0))
+        return self.offsets
+
+    def __getitem__(self, index):
+        """Return the item at an index, or a list for a slice."""
+        if isinstance(index, slice):
+            return self.get_slice(*index.indices(self.length))
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("list index out of range")
+        offsets = self.sublist_offsets()
+        pos = bisect_right(offsets, index) - 1
+        return self.sublists[pos][index - offsets[pos]]
+
+    def get_slice(self, start, stop, step):
+        """Return the items from start to stop as a list, slicing each
+        sublist once instead of looking up every position."""
+        if step < 0:
+            # Take the same positions walking forwards, then reverse them.
+            positions = range(start, stop, step)
+            if not positions:
+                return []
+            return self.get_slice(positions[-1], positions[0] + 1,
+                                  -step)[::-1]
+
+        offsets = self.sublist_offsets()
+        items = []
+        while start < stop:
+            pos = bisect_right(offsets, start) - 1
+            piece = self.sublists[pos][start - offsets[pos]:
+                                       stop - offsets[pos]:step]
+            items.extend(piece)
+            start += len(piece) * step
+        return items
+
+    def index(self, item):
+        """Return the position of the first occurrence of item."""
+        found = self.locate(item)
+        if found is None:
+            raise ValueError(f"{item!r} is not in the list")
+        pos, index = found
+        return self.sublist_offsets()[pos] + index
+
+    def irange(self, minimum=None, maximum=None):
+        """Yield the items whose keys are between minimum and maximum,
+        inclusive. Leave either one out for an open-ended range."""
+        if minimum is None:
+            pos, index = 0, 0
+        else:
+            pos = bisect_left(self.maxes, minimum)
+            if pos == len(self.maxes):
+                return
+            index = bisect_left(self.sublist_keys[pos], minimum)
+
+        while pos < len(self.sublists):
+            keys = self.sublist_keys[pos]
+            stop = (len(keys) if maximum is None
+                    else bisect_right(keys, maximum))
+            yield from self.sublists[pos][index:stop]
+            if stop < len(keys):
+                return
+            pos, index = pos + 1, 0
+
+    def __repr__(self):
+        return f"SortedList({list(self)!r})"
+
+# ==> Adding artists to a sorted playlist <==
+artists = SortedList(['cesaria evora', 'Lira', 'djimi dludlu'],
+                     key=str.lower)
+artists.add('Moreira Chonguissa')
+artists.add('azagaia')
+
+print(artists)
+print("First artist:", artists[0])
+print("From c to l:", list(artists.irange('c', 'lz')))
+print("Reversed:", list(reversed(artists)))
+
+artists.remove('Lira')
+print(artists)
+
+# ==> Comparing with sorting after every change <==
+import random
+import string
+import time
+
+random.seed(13)
+
+
+def random_name():
+    """Return a made-up artist name."""
+    return ''.join(random.choices(string.ascii_lowercase, k=10))
+
+# Make num_names bigger, say a million, to see the gap grow.
+num_names = 100000
+names = [random_name() for _ in range(num_names)]
+new_names = [random_name() for _ in range(20)]
+
+playlist = sorted(names)
+start = time.perf_counter()
+for name in new_names:
+    playlist.append(name)
+    playlist.sort()
+sort_seconds = time.perf_counter() - start
+
+sorted_playlist = SortedList(names)
+start = time.perf_counter()
+for name in new_names:
+    sorted_playlist.add(name)
+add_seconds = time.perf_counter() - start
+
+print(f"20 updates to {num_names:,} names: sort() {sort_seconds:.3f}s, "
+      f"SortedList.add() {add_seconds:.5f}s")
+
+######################################################################################
+#### Working at both ends of a list ####
+######################################################################################
+# A list keeps its items next to each other in memory, so artists.pop(0) and
+# countries.insert(1, ...) have to shift every item that comes after them.
+# Done once this doesn't matter, but emptying a list from the front with
+# pop(0) takes time proportional to the square of its length. A deque
+# (double-ended queue) from the 'collections' module can add and remove items
+# at either end without shifting anything, and an insert near either end
+# only moves the items between that end and the insert position.
+
+# ==> A playlist built on a deque <==
+from collections import deque
+
+
+class Playlist():
+    """A queue of songs with fast operations at both ends."""
+
+    def __init__(self, songs=()):
+        """Start with an optional sequence of songs."""
+        self.songs = deque(songs)
+
+    def append(self, song):
+        """Add a song to the end of the playlist."""
+        self.songs.append(song)
+
+    def append_left(self, song):
+        """Add a song to the front of the playlist."""
+        self.songs.appendleft(song)
+
+    def pop(self):
+        """Remove and return the last song."""
+        return self.songs.pop()
+
+    def pop_left(self):
+        """Remove and return the first song."""
+        return self.songs.popleft()
+
+    def insert(self, index, song):
+        """Insert a song before index, moving as few songs as possible."""
+        self.songs.insert(index, song)
+
+    def drain(self, reverse=False):
+        """Remove and yield every song, from the front or from the back."""
+        take = self.songs.pop if reverse else self.songs.popleft
+        while self.songs:
+            yield take()
+
+    def __getitem__(self, index):
+        return self.songs[index]
+
+    def __len__(self):
+        return len(self.songs)
+
+    def __iter__(self):
+        return iter(self.songs)
+
+    def __repr__(self):
+        return f"Playlist({list(self.songs)!r})"
+
+# ==> Playing songs in order <==
+artists = Playlist(['cesaria evora', 'djimi dludlu', 'moreira chonguissa'])
+artists.append('lira')
+artists.append_left('azagaia')
+artists.insert(1, 'stewart sukuma')
+print(artists)
+
+print("Now playing:", artists.pop_left())
+for artist in artists.drain():
+    print("Playing " + artist + " music!")
+print("Songs left:", len(artists))
+
+# ==> Comparing pop(0) with a deque <==
+# Doubling the number of songs roughly quadruples the time for pop(0), but
+# only doubles the time for the playlist.
+import time
+
+for num_songs in (10000, 20000, 40000):
+    songs = list(range(num_songs))
+    start = time.perf_counter()
+    while songs:
+        songs.pop(0)
+    list_seconds = time.perf_counter() - start
+
+    playlist = Playlist(range(num_songs))
+    start = time.perf_counter()
+    for song in playlist.drain():
+        pass
+    playlist_seconds = time.perf_counter() - start
+
+    print(f"{num_songs} songs: pop(0) {list_seconds:.3f}s, "
+          f"drain() {playlist_seconds:.3f}s")
+
+######################################################################################
+#### Lazy lists of numbers ####
+######################################################################################
+# list(range(1, 1000001)) stores a million numbers just so we can ask how many
+# there are, and a comprehension like [x ** 2 for x in numbers] builds a
+# second full list. A range already knows its length and can compute any of
+# its items without storing them. A lazy sequence can do the same for
+# expressions: it remembers the operations you ask for, and only computes
+# the values when you loop over them, reduce them, or ask for a typed array.
+
+# ==> A lazy sequence of numbers <==
+import operator
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# The largest whole number NumPy's int64 can hold, and the operations that
+# fail on zero.
+INT64_MAX = 2 ** 63 - 1
+DIVISIONS = (operator.truediv, operator.floordiv, operator.mod)
+
+
+class LazyNumbers():
+    """A sequence of numbers computed from a range or array on demand."""
+
+    # Set this to False to always compute with plain Python.
+    use_numpy = np is not None
+
+    def __init__(self, source, operations=()):
+        """Wrap a range or an array, with operations to apply later."""
+        self.source = source
+        self.operations = operations
+
+    def apply(self, value):
+        """Apply every remembered operation to one value."""
+        for function, operand, reflected in self.operations:
+            if reflected:
+                value = function(operand, value)
+            else:
+                value = function(value, operand)
+        return value
+
+    def combine(self, function, operand, reflected=False):
+        """Return a new lazy sequence with one more operation."""
+        if not isinstance(operand, (int, float)):
+            # Let Python try the other operand, or raise TypeError.
+            return NotImplemented
+        return LazyNumbers(self.source,
+                           self.operations + ((function, operand, reflected),))
+
+    def __add__(self, number):
+        return self.combine(operator.add, number)
+
+    def __radd__(self, number):
+        return self.combine(operator.add, number, reflected=True)
+
+    def __sub__(self, number):
+        return self.combine(operator.sub, number)
+
+    def __rsub__(self, number):
+        return self.combine(operator.sub, number, reflected=True)
+
+    def __mul__(self, number):
+        return self.combine(operator.mul, number)
+
+    def __rmul__(self, number):
+        return self.combine(operator.mul, number, reflected=True)
+
+    def __truediv__(self, number):
+        return self.combine(operator.truediv, number)
+
+    def __rtruediv__(self, number):
+        return self.combine(operator.truediv, number, reflected=True)
+
+    def __floordiv__(self, number):
+        return self.combine(operator.floordiv, number)
+
+    def __mod__(self, number):
+        return self.combine(operator.mod, number)
+
+    def __pow__(self, number):
+        return self.combine(operator.pow, number)
+
+    def __rpow__(self, number):
+        return self.combine(operator.pow, number, reflected=True)
+
+    def __neg__(self):
+        return self.combine(operator.mul, -1)
+
+    def __len__(self):
+        return len(self.source)
+
+    def __getitem__(self, index):
+        """Compute one item, or return a lazy slice."""
+        if isinstance(index, slice):
+            return LazyNumbers(self.source[index], self.operations)
+        return self.apply(self.source[index])
+
+    def __iter__(self):
+        if not self.operations:
+            return iter(self.source)
+        return map(self.apply, self.source)
+
+    def numpy_is_exact(self, summing=False):
+        """Return True if NumPy gives the same values as plain Python.
+
+        NumPy stores whole numbers in 64 bits and silently wraps around when
+        a value gets too big, where Python's integers just keep growing. So
+        we follow the biggest possible size of a value through each operation,
+        and only use NumPy when it can't overflow.
+        """
+        if not self.use_numpy or not len(self):
+            return False
+
+        if isinstance(self.source, range):
+            bound = max(abs(self.source[0]), abs(self.source[-1]))
+            whole = True
+        else:
+            values = np.frombuffer(self.source, dtype=self.source.typecode)
+            bound = max(abs(values.min().item()), abs(values.max().item()))
+            whole = self.source.typecode not in 'fd'
+
+        for function, operand, reflected in self.operations:
+            if isinstance(operand, bool) or not isinstance(operand,
+                                                           (int, float)):
+                return False
+            if function is operator.pow and (reflected or not whole
+                                             or operand < 0
+                                             or isinstance(operand, float)):
+                # Python raises or switches to floats where NumPy doesn't.
+                return False
+            if function in DIVISIONS and (reflected or operand == 0):
+                return False
+            if not whole or isinstance(operand, float):
+                whole = False
+            elif function is operator.truediv:
+                whole = False
+            elif function in (operator.add, operator.sub):
+                bound += abs(operand)
+            elif function is operator.mul:
+                bound *= abs(operand)
+            elif function is operator.floordiv:
+                bound += 1
+            elif function is operator.mod:
+                bound = abs(operand)
+            elif function is operator.pow:
+                bound **= operand
+            if whole and bound > INT64_MAX:
+                return False
+
+        if summing and whole and bound * len(self) > INT64_MAX:
+            return False
+        return True
+
+    def to_numpy(self):
+        """Compute every value at once with NumPy."""
+        if isinstance(self.source, range):
+            values = np.arange(self.source.start, self.source.stop,
+                               self.source.step, dtype=np.int64)
+        else:
+            values = np.frombuffer(self.source, dtype=self.source.typecode)
+            # Small integer types would overflow even sooner.
+            values = values.astype(np.float64 if self.source.typecode in 'fd'
+                                   else np.int64)
+        for function, operand, reflected in self.operations:
+            if reflected:
+                values = function(operand, values)
+            else:
+                values = function(values, operand)
+        return values
+
+    def evaluate(self):
+        """Return the values in a typed array: 'q' for whole numbers and
+        'd' for floats."""
+        if not len(self):
+            return array('q')
+        typecode = 'q' if isinstance(self[0], int) else 'd'
+        if self.numpy_is_exact():
+            return array(typecode, self.to_numpy().astype(typecode).tobytes())
+        return array(typecode, self)
+
+    def sum(self):
+        """Return the sum of the values."""
+        if self.numpy_is_exact(summing=True):
+            return self.to_numpy().sum().item()
+        return sum(self)
+
+    def min(self):
+        """Return the smallest value."""
+        if self.numpy_is_exact():
+            return self.to_numpy().min().item()
+        return min(self)
+
+    def max(self):
+        """Return the largest value."""
+        if self.numpy_is_exact():
+            return self.to_numpy().max().item()
+        return max(self)
+
+    def mean(self):
+        """Return the mean of the values."""
+        return self.sum() / len(self)
+
+    def __repr__(self):
+        if len(self) > 6:
+            shown = ', '.join(repr(value) for value in self[:6])
+            return f"LazyNumbers([{shown}, ...], length={len(self)})"
+        return f"LazyNumbers({list(self)!r})"
+
+# ==> A million numbers without a list <==
+numbers = LazyNumbers(range(1, 1000001))
+print(len(numbers))
+
+squares = numbers ** 2
+print(squares)
+print("Sum of the squares:", squares.sum())
+
+# ==> The heights example, computed on demand <==
+heights = LazyNumbers(range(1, 11)) * 10 / 5
+print(heights.evaluate())
+print("Tallest:", heights.max(), "average:", heights.mean())
+
+# ==> Checking NumPy against plain Python <==
+# The sum of the cubes of a hundred thousand numbers doesn't fit in 64 bits,
+# so it's added up with Python's integers even when NumPy is installed.
+import math
+
+expressions = [LazyNumbers(range(1, 100001)) ** 2,
+               LazyNumbers(range(1, 100001)) ** 4,
+               LazyNumbers(range(-500, 500)) * 3 - 7, heights,
+               LazyNumbers(array('b', [-100, 50, 120])) * 1000]
+
+def results(expression):
+    """Return the reductions of an expression, and its typed array."""
+    try:
+        values = list(expression.evaluate())
+    except OverflowError:
+        # Too big for a 64-bit array, whichever way it's computed.
+        values = None
+    return expression.sum(), expression.min(), expression.max(), values
+
+for expression in expressions:
+    fast = results(expression)
+    LazyNumbers.use_numpy = False
+    slow = results(expression)
+    LazyNumbers.use_numpy = np is not None
+    assert all(math.isclose(a, b) for a, b in zip(fast[:3], slow[:3]))
+    assert fast[3] == slow[3]
+
+print("Sum of the cubes up to 100,000:",
+      (LazyNumbers(range(1, 100001)) ** 3).sum())
+
+######################################################################################
+#### Slicing without copying ####
+######################################################################################
+# Every slice of a list is a new list, so paging through a huge list one
+# slice at a time copies every page. A view remembers which list it belongs
+# to and which positions it covers, and reads the items straight from that
+# list. A range object can describe those positions, and slicing a range
+# gives another range, so a slice of a view is just another view.
+#
+# Changing an item in the list shows up in every view of it. Adding or
+# removing items changes which item is at each position, so a view stops
+# working when its list changes length: any use after that raises a
+# RuntimeError. Call materialize() to keep a copy that doesn't depend on the
+# list.
+
+# ==> A view of part of a list <==
+class ListView():
+    """A window into a list that doesn't copy any items."""
+
+    def __init__(self, parent, positions=None):
+        """Make a view of parent covering a range of positions."""
+        self.parent = parent
+        self.parent_length = len(parent)
+        if positions is None:
+            positions = range(self.parent_length)
+        self.positions = positions
+
+    def check(self):
+        """Make sure the parent list hasn't been resized."""
+        if len(self.parent) != self.parent_length:
+            raise RuntimeError("the list behind this view was resized")
+
+    def __len__(self):
+        self.check()
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        """Return an item, or a new view for a slice."""
+        self.check()
+        if isinstance(index, slice):
+            view = ListView(self.parent, self.positions[index])
+            view.parent_length = self.parent_length
+            return view
+        return self.parent[self.positions[index]]
+
+    def __setitem__(self, index, value):
+        """Change an item in the parent list."""
+        self.check()
+        self.parent[self.positions[index]] = value
+
+    def __iter__(self):
+        self.check()
+        parent = self.parent
+        for position in self.positions:
+            yield parent[position]
+
+    def materialize(self):
+        """Return the items in the view as a new list."""
+        self.check()
+        step = self.positions.step
+        if step > 0:
+            return self.parent[self.positions.start:self.positions.stop:step]
+        return [self.parent[position] for position in self.positions]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, ListView)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ListView({self.materialize()!r})"
+
+
+def pages(items, page_size):
+    """Yield views of items, page_size items at a time."""
+    view = ListView(items)
+    for start in range(0, len(items), page_size):
+        yield view[start:start + page_size]
+
+# ==> Getting the middle without copying <==
+programming_languages = ['assembly', 'c', 'c++', 'python', 'ruby']
+middle_three = ListView(programming_languages)[1:4]
+print(middle_three)
+
+last_two = middle_three[-2:]
+print(last_two, len(last_two))
+
+programming_languages[3] = 'go'
+print(last_two)
+
+copy_of_middle = middle_three.materialize()
+programming_languages.append('rust')
+print(copy_of_middle)
+
+try:
+    print(middle_three)
+except RuntimeError as exc:
+    print(exc)
+
+# ==> Paging through a long list <==
+numbers = list(range(1, 1000001))
+for page_num, page in enumerate(pages(numbers, 250000), start=1):
+    print("Page", page_num, "starts with", page[0], "and ends with",
+          page[-1])
+
+######################################################################################
+#### Running a comprehension in parallel ####
+######################################################################################
+# A comprehension runs on one CPU core. The 'concurrent.futures' module can
+# hand chunks of the work to a pool of worker processes (or threads) and
+# collect the results. Sending work to another process costs time, so the
+# items are sent in chunks, and the chunk size is chosen by timing the
+# function on the first few items. Results come back in the original order
+# as soon as they're ready, and only a few chunks are in flight at once, so
+# the input can be a generator that's too long to fit in memory.
+#
+# Threads only help when the function waits on something, like the network
+# or a file, or when it releases the GIL. Processes can run Python code in
+# parallel, but the function and items have to be picklable, so lambdas
+# don't work with them.
+#
+# On Windows and macOS, each worker process starts by importing the main
+# program, so everything that isn't under an "if __name__ == '__main__':"
+# guard runs again in every worker. Keep parallel_map and the functions it
+# runs in their own module, and keep the program that uses them under the
+# guard, so the workers only import what they need. This tutorial file runs
+# all of its other examples at the top level, so worker processes started
+# from it would run them all again. The examples below use threads
+# (executor='thread') instead; to try them with processes, save parallel.py
+# and run them from a file of their own.
+
+# ==> A parallel map module (save this as parallel.py) <==
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def run_chunk(func, chunk):
+    """Apply func to every item in a chunk (runs in a worker)."""
+    return [func(item) for item in chunk]
+
+
+def parallel_map(func, iterable, chunksize=None, executor='process',
+                 max_workers=None, target_seconds=0.05):
+    """Yield func(item) for every item, in order, computed in parallel.
+
+    If chunksize is None, it's picked so each chunk takes about
+    target_seconds, based on timing func on the first few items.
+    """
+    if executor not in ('process', 'thread'):
+        raise ValueError("executor must be 'process' or 'thread'")
+    items = iter(iterable)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if chunksize is None:
+        # Time a small sample here, and hand back its results first.
+        sample = list(itertools.islice(items, 32))
+        start = time.perf_counter()
+        yield from [func(item) for item in sample]
+        per_item = (time.perf_counter() - start) / max(len(sample), 1)
+        chunksize = int(target_seconds / per_item) if per_item else 100000
+        chunksize = max(1, min(chunksize, 100000))
+
+    pool_class = (ProcessPoolExecutor if executor == 'process'
+                  else ThreadPoolExecutor)
+    with pool_class(max_workers=max_workers) as pool:
+        # Keep a couple of chunks per worker in flight.
+        pending = deque()
+        while True:
+            while len(pending) < 2 * max_workers:
+                chunk = list(itertools.islice(items, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(run_chunk, func, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def square(x):
+    """Return the square of x."""
+    return x ** 2
+
+
+def count_divisors(n):
+    """Return how many numbers divide n evenly."""
+    return sum(1 for divisor in range(1, n + 1) if n % divisor == 0)
+
+
+def sweep_cost(costs=(1, 10, 100, 1000, 10000), total_work=10 ** 6,
+               **options):
+    """Time a comprehension and parallel_map on count_divisors() for each
+    per-item cost, keeping the total work the same. Return a list of
+    (cost, number of items, comprehension seconds, parallel_map seconds)."""
+    rows = []
+    for cost in costs:
+        items = [cost] * (total_work // cost)
+
+        start = time.perf_counter()
+        [count_divisors(item) for item in items]
+        serial_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for result in parallel_map(count_divisors, items, **options):
+            pass
+        parallel_seconds = time.perf_counter() - start
+
+        rows.append((cost, len(items), serial_seconds, parallel_seconds))
+    return rows
+
+# ==> Converting city names to upper case in parallel <==
+# from parallel import parallel_map, square # uncomment this line
+if __name__ == '__main__':
+    cities = ['matola', 'marracuene', 'polana', 'boane', 'ntenga']
+
+    upper_cities = list(parallel_map(str.upper, cities, executor='thread'))
+    print(upper_cities)
+
+    squares = list(parallel_map(square, range(1, 11), chunksize=3,
+                                executor='thread'))
+    print(squares)
+
+# ==> When does parallelism pay off? <==
+# A cheap function like str.upper() is faster in a plain comprehension,
+# because sending the items to the workers costs more than the work itself.
+# An expensive function gets faster with every extra CPU core. Sweeping the
+# cost of each item, with the same total work every time, shows where the
+# crossover is on your machine. Threads take turns running Python code, so
+# here parallel_map can't beat the comprehension; run the sweep from a file
+# of its own with executor='process' to see the crossover.
+# from parallel import sweep_cost # uncomment this line
+if __name__ == '__main__':
+    print("CPU cores:", os.cpu_count())
+    crossover = None
+    for cost, count, serial_seconds, parallel_seconds in sweep_cost(
+            total_work=10 ** 5, executor='thread'):
+        print(f"{count:>8} items costing {cost:>5}: "
+              f"comprehension {serial_seconds:.2f}s, "
+              f"parallel_map {parallel_seconds:.2f}s")
+        # Count small differences as noise.
+        if crossover is None and parallel_seconds < 0.9 * serial_seconds:
+            crossover = cost
+    if crossover is None:
+        print("parallel_map was never clearly faster here")
+    else:
+        print("parallel_map was clearly faster from a cost of", crossover)
+
+######################################################################################
+#### Measuring loops, comprehensions and map() ####
+######################################################################################
+# Comprehensions are described above as more efficient than loops, and the
+# way to check a claim like that is to measure it. A small benchmark runs each
+# version of the code several times on inputs of different sizes, and reports
+# the mean time, how much the times vary (the standard deviation) and how
+# much memory was allocated. Saving the results as JSON lets you compare runs
+# on different Python versions later.
+
+# ==> A micro-benchmark suite <==
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# The idioms for each example all return the same values.
+def loop_squares(numbers):
+    squares = []
+    for x in numbers:
+        square = x ** 2
+        squares.append(square)
+    return squares
+
+def comprehension_squares(numbers):
+    return [x ** 2 for x in numbers]
+
+def map_squares(numbers):
+    return list(map(lambda x: x ** 2, numbers))
+
+def generator_squares(numbers):
+    return list(x ** 2 for x in numbers)
+
+def numpy_squares(numbers):
+    return np.asarray(numbers) ** 2
+
+def loop_upper(cities):
+    upper_cities = []
+    for city in cities:
+        upper_city = city.upper()
+        upper_cities.append(upper_city)
+    return upper_cities
+
+def comprehension_upper(cities):
+    return [city.upper() for city in cities]
+
+def map_upper(cities):
+    return list(map(str.upper, cities))
+
+def generator_upper(cities):
+    return list(city.upper() for city in cities)
+
+def numpy_upper(cities):
+    return np.char.upper(np.asarray(cities))
+
+def loop_heights(values):
+    heights = []
+    for value in values:
+        heights.append(value * 10 / 5)
+    return heights
+
+def comprehension_heights(values):
+    return [value * 10 / 5 for value in values]
+
+def map_heights(values):
+    return list(map(lambda value: value * 10 / 5, values))
+
+def generator_heights(values):
+    return list(value * 10 / 5 for value in values)
+
+def numpy_heights(values):
+    return np.asarray(values) * 10 / 5
+
+# Each example lists its idioms, and how to make an input of a given size.
+EXAMPLES = {
+    'squares': ([loop_squares, comprehension_squares, map_squares,
+                 generator_squares, numpy_squares],
+                lambda size: list(range(1, size + 1))),
+    'upper': ([loop_upper, comprehension_upper, map_upper, generator_upper,
+               numpy_upper],
+              lambda size: ['matola', 'marracuene', 'polana', 'boane',
+                            'ntenga'] * (size // 5)),
+    'heights': ([loop_heights, comprehension_heights, map_heights,
+                 generator_heights, numpy_heights],
+                lambda size: list(range(1, size + 1))),
+}
+
+
+def measure(func, data, repeat=5):
+    """Return the mean and standard deviation of func(data)'s run time in
+    seconds, and the bytes it allocated."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+
+    # Allocations are measured in a separate run, because tracing memory
+    # slows the code down.
+    tracemalloc.start()
+    func(data)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'mean': statistics.mean(times),
+            'stdev': statistics.stdev(times) if repeat > 1 else 0.0,
+            'allocated_bytes': peak}
+
+
+def run_benchmarks(sizes=(1000, 100000), repeat=5):
+    """Run every idiom of every example, and return the results."""
+    results = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'date': datetime.now(timezone.utc).isoformat(),
+        'results': [],
+    }
+    for example, (idioms, make_input) in EXAMPLES.items():
+        for size in sizes:
+            data = make_input(size)
+            for func in idioms:
+                if func.__name__.startswith('numpy') and np is None:
+                    continue
+                timing = measure(func, data, repeat)
+                timing.update(example=example, idiom=func.__name__,
+                              size=size)
+                results['results'].append(timing)
+    return results
+
+
+def save_results(results, filename=None):
+    """Save results as JSON, named after the Python version by default."""
+    if filename is None:
+        filename = f"benchmarks-python-{results['python']}.json"
+    with open(filename, 'w') as file_object:
+        json.dump(results, file_object, indent=2)
+    return filename
+
+
+def compare_results(old_filename, new_filename):
+    """Print how much faster or slower each idiom got between two runs."""
+    with open(old_filename) as file_object:
+        old = json.load(file_object)
+    with open(new_filename) as file_object:
+        new = json.load(file_object)
+
+    old_times = {(row['idiom'], row['size']): row['mean']
+                 for row in old['results']}
+    print(f"Python {old['python']} -> Python {new['python']}")
+    for row in new['results']:
+        key = (row['idiom'], row['size'])
+        if key in old_times:
+            ratio = old_times[key] / row['mean']
+            print(f"  {row['idiom']:>22} {row['size']:>8}: {ratio:.2f}x")
+
+# ==> Running the benchmarks <==
+import os
+import tempfile
+
+if __name__ == '__main__':
+    results = run_benchmarks(sizes=(1000, 100000), repeat=5)
+    for row in results['results']:
+        print(f"{row['idiom']:>22} {row['size']:>8}: "
+              f"{row['mean'] * 1000:8.3f} ms "
+              f"± {row['stdev'] * 1000:.3f}, "
+              f"{row['allocated_bytes']:>10} bytes")
+
+    filename = save_results(results, os.path.join(
+        tempfile.gettempdir(), f"benchmarks-python-{results['python']}.json"))
+    print("Saved results to", filename)
+
+    # After running the suite on another Python version, compare the files:
+    # compare_results('benchmarks-python-3.11.7.json',
+    #                 'benchmarks-python-3.12.1.json')
+
+######################################################################################
+#### The first few items of a sorted list ####
+######################################################################################
+# sorted(artists)[:3] sorts the whole list just to keep three items. A heap
+# can find the k smallest items while only ever holding k of them, which
+# takes time proportional to n log k instead of n log n. The 'heapq' module
+# provides nsmallest() and nlargest(), which give exactly the same result as
+# sorting and slicing, including keeping equal items in their original
+# order. For items that arrive a few at a time, a class can keep the heap
+# between calls.
+
+# ==> The top k items <==
+import heapq
+
+
+def top_k(iterable, k, key=None, reverse=False):
+    """Return the same list as sorted(iterable, key=key,
+    reverse=reverse)[:k], without sorting everything."""
+    if reverse:
+        return heapq.nlargest(k, iterable, key=key)
+    return heapq.nsmallest(k, iterable, key=key)
+
+
+class ReversedOrder():
+    """Wrap a value so that comparisons go the other way."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+class StreamingTopK():
+    """Keep the top k items of a stream that arrives a little at a time."""
+
+    def __init__(self, k, key=None, reverse=False):
+        """Start with no items."""
+        self.k = k
+        self.key = key
+        self.reverse = reverse
+        self.count = 0
+        # The root of the heap is the kept item that would go last in the
+        # result, so it's the next one to be pushed out by a better item.
+        self.heap = []
+
+    def push(self, item):
+        """Offer one item."""
+        if self.k <= 0:
+            return
+        item_key = item if self.key is None else self.key(item)
+        # The count breaks ties, so equal items keep their arrival order.
+        if self.reverse:
+            rank = (item_key, -self.count)
+        else:
+            rank = ReversedOrder((item_key, self.count))
+        self.count += 1
+
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (rank, item))
+        elif self.heap[0][0] < rank:
+            heapq.heapreplace(self.heap, (rank, item))
+
+    def extend(self, items):
+        """Offer every item from an iterable or iterator."""
+        for item in items:
+            self.push(item)
+        return self
+
+    def result(self):
+        """Return the top items seen so far, in sorted order."""
+        ranked = sorted(self.heap, reverse=True)
+        return [item for rank, item in ranked]
+
+# ==> The first artists in alphabetical order <==
+artists = ['cesaria evora', 'djimi dludlu', 'moreira chonguissa', 'lira',
+           'azagaia', 'Mingas']
+
+print(top_k(artists, 3))
+print(top_k(artists, 3, key=str.lower))
+print(top_k(artists, 2, key=len, reverse=True))
+
+# ==> Keeping the top artists of a stream <==
+top_artists = StreamingTopK(3, key=str.lower)
+top_artists.extend(iter(artists[:3]))
+print(top_artists.result())
+top_artists.extend(iter(artists[3:]))
+print(top_artists.result())
+print(top_artists.result() == sorted(artists, key=str.lower)[:3])
+
+######################################################################################
+#### Sorting lists that don't fit in memory ####
+######################################################################################
+# artists.sort() needs the whole list in memory. A file of names that's
+# bigger than your computer's memory can still be sorted in two steps: read
+# as many names as fit in memory, sort them, and write them to a temporary
+# file (a "run"); then read all the runs at once and merge them, always
+# taking the smallest name at the front of any run. heapq.merge() does the
+# merging, reading one name at a time from each run. Because the runs are
+# made in order and merge() prefers earlier runs when names are equal, the
+# result is in exactly the order sorted() would give.
+
+# ==> An external merge sort <==
+import heapq
+import os
+import sys
+import tempfile
+
+
+def read_lines(filename):
+    """Yield the lines of a text file without their newlines."""
+    with open(filename, encoding='utf-8') as file_object:
+        for line in file_object:
+            yield line.rstrip('\n')
+
+
+def write_run(items):
+    """Write sorted items to a temporary file, one per line."""
+    # newline='\n' stops a '\r' inside an item from being read back as the
+    # end of a line.
+    run = tempfile.TemporaryFile('w+', encoding='utf-8', newline='\n')
+    run.writelines(item + '\n' for item in items)
+    run.seek(0)
+    return run
+
+
+def read_run(run):
+    """Yield the items in a run, and close it at the end."""
+    with run:
+        for line in run:
+            yield line[:-1]
+
+
+def external_sort(source, key=None, reverse=False, memory_limit=100000000):
+    """Yield the strings from a file name or an iterable in sorted order,
+    keeping about memory_limit bytes of them in memory at a time.
+
+    The strings can't contain '\n' or '\r', because the runs store one
+    string per line; a ValueError is raised for those.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = read_lines(source)
+
+    runs = []
+    try:
+        items = []
+        used = 0
+        for item in source:
+            # Check every item, so the result doesn't depend on whether the
+            # sort needed any runs.
+            if '\n' in item or '\r' in item:
+                raise ValueError(f"can't sort {item!r}: it contains a "
+                                 f"line break")
+            items.append(item)
+            used += sys.getsizeof(item) + 8
+            if used >= memory_limit:
+                items.sort(key=key, reverse=reverse)
+                runs.append(write_run(items))
+                items = []
+                used = 0
+        items.sort(key=key, reverse=reverse)
+
+        if not runs:
+            # Everything fit in memory, so there's nothing to merge.
+            yield from items
+            return
+        if items:
+            runs.append(write_run(items))
+            items = []
+        yield from heapq.merge(*(read_run(run) for run in runs),
+                               key=key, reverse=reverse)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def write_lines(filename, lines):
+    """Write lines to a text file, one per line."""
+    with open(filename, 'w', encoding='utf-8') as file_object:
+        file_object.writelines(line + '\n' for line in lines)
+
+# ==> Sorting a file of artists <==
+artists = ['cesaria evora', 'Lira', 'djimi dludlu', 'moreira chonguissa',
+           'azagaia', 'lira']
+filename = os.path.join(tempfile.gettempdir(), 'artists.txt')
+write_lines(filename, artists)
+
+# A tiny memory limit forces the sort to use several runs.
+print(list(external_sort(filename, memory_limit=200)))
+print(list(external_sort(filename, key=str.lower, memory_limit=200)))
+print(list(external_sort(filename, key=str.lower, memory_limit=200)) ==
+      sorted(artists, key=str.lower))
+os.remove(filename)
+
+# ==> Sorting ten times more names than the memory limit <==
+# A real test would use a file ten times bigger than your computer's memory;
+# here the memory limit is set to a tenth of the size of the names instead.
+import random
+import string
+import time
+
+random.seed(21)
+names = [''.join(random.choices(string.ascii_lowercase, k=12))
+         for _ in range(100000)]
+filename = os.path.join(tempfile.gettempdir(), 'names.txt')
+write_lines(filename, names)
+
+names_size = sum(sys.getsizeof(name) + 8 for name in names)
+start = time.perf_counter()
+sorted_file = os.path.join(tempfile.gettempdir(), 'sorted_names.txt')
+write_lines(sorted_file, external_sort(filename,
+                                       memory_limit=names_size // 10))
+print(f"external_sort: {time.perf_counter() - start:.2f}s")
+
+start = time.perf_counter()
+sorted_names = sorted(names)
+print(f"sorted() in memory: {time.perf_counter() - start:.2f}s")
+print(list(read_lines(sorted_file)) == sorted_names)
+
+os.remove(filename)
+os.remove(sorted_file)
\ No newline at end of file
@@ -304,4 +304,1647 @@ for alien_num in range(1000000):
 
 # Prove the list contains a million items
 num_aliens = len(aliens)
-print("Number of aliens created:", num_aliens)
\ No newline at end of file
+print("Number of aliens created:", num_aliens)
+
+######################################################################################
+## Storing a million aliens column by column
+######################################################################################
+# A list of dictionaries repeats the same four keys for every alien, so each
+# alien costs a few hundred bytes. When all the dictionaries have the same
+# keys you can store each field in its own typed array instead; this is
+# called a struct of arrays. The 'array' module stores numbers compactly, and
+# when NumPy is installed the same arrays are used for vectorized operations
+# that work on every alien in one step.
+
+# ==> A fleet of aliens stored as columns <==
+from array import array
+from collections.abc import MutableMapping
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class AlienView(MutableMapping):
+    """A dictionary-like view of one alien in a fleet."""
+
+    def __init__(self, fleet, index):
+        """Remember the fleet and the position of the alien."""
+        self.fleet = fleet
+        self.index = index
+
+    def __getitem__(self, key):
+        if key == 'color':
+            return self.fleet.colors[self.fleet.color[self.index]]
+        if key in ('points', 'x', 'y'):
+            return getattr(self.fleet, key)[self.index]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'color':
+            self.fleet.color[self.index] = self.fleet.color_code(value)
+        elif key in ('points', 'x', 'y'):
+            getattr(self.fleet, key)[self.index] = value
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key):
+        raise TypeError("fields can't be removed from an alien in a fleet")
+
+    def __iter__(self):
+        return iter(AlienFleet.fields)
+
+    def __len__(self):
+        return len(AlienFleet.fields)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class AlienFleet():
+    """Store many aliens with one typed array per field."""
+
+    fields = ('color', 'points', 'x', 'y')
+
+    def __init__(self, colors=('green', 'yellow', 'red')):
+        """Start with an empty fleet."""
+        # Colors are stored as small integer codes.
+        self.colors = list(colors)
+        self.color = array('B')
+        self.points = array('q')
+        self.x = array('q')
+        self.y = array('q')
+
+    def color_code(self, color):
+        """Return the code for a color, adding new colors as needed."""
+        if color not in self.colors:
+            if len(self.colors) == 256:
+                raise ValueError("a fleet can hold at most 256 colors")
+            self.colors.append(color)
+        return self.colors.index(color)
+
+    def append(self, color='green', points=5, x=0, y=0):
+        """Add one alien to the fleet."""
+        self.color.append(self.color_code(color))
+        self.points.append(points)
+        self.x.append(x)
+        self.y.append(y)
+
+    def add_row(self, num_aliens, color='green', points=5, spacing=20, y=0):
+        """Add a row of aliens that start out the same."""
+        start = len(self) and self.x[-1] + spacing
+        self.color.extend(bytes([self.color_code(color)]) * num_aliens)
+        self.points.extend(array('q', [points]) * num_aliens)
+        self.x.extend(range(start, start + spacing * num_aliens, spacing))
+        self.y.extend(array('q', [y]) * num_aliens)
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, index):
+        """Return a view of one alien, or a list of views for a slice."""
+        if isinstance(index, slice):
+            return [AlienView(self, alien_num)
+                    for alien_num in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("alien index out of range")
+        return AlienView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield AlienView(self, index)
+
+    def move(self, dx=0, dy=0):
+        """Move every alien by dx and dy."""
+        if np is not None:
+            np.frombuffer(self.x, dtype=self.x.typecode)[:] += dx
+            np.frombuffer(self.y, dtype=self.y.typecode)[:] += dy
+        else:
+            if dx:
+                self.x = array('q', [x + dx for x in self.x])
+            if dy:
+                self.y = array('q', [y + dy for y in self.y])
+
+    def total_points(self):
+        """Return the points earned by shooting down every alien."""
+        if np is not None:
+            return int(np.frombuffer(self.points, dtype='q').sum())
+        return sum(self.points)
+
+    def recolor(self, new_color, where):
+        """Change the color of the aliens for which where(points, x, y) is
+        true, and return how many aliens changed.
+
+        Write 'where' with comparison operators only, so it works on single
+        numbers as well as on whole NumPy columns.
+        """
+        code = self.color_code(new_color)
+        if np is not None:
+            mask = where(np.frombuffer(self.points, dtype='q'),
+                         np.frombuffer(self.x, dtype='q'),
+                         np.frombuffer(self.y, dtype='q'))
+            np.frombuffer(self.color, dtype='B')[mask] = code
+            return int(np.count_nonzero(mask))
+
+        changed = 0
+        for index, alien in enumerate(zip(self.points, self.x, self.y)):
+            if where(*alien):
+                self.color[index] = code
+                changed += 1
+        return changed
+
+# ==> A hundred thousand aliens in a fleet <==
+fleet = AlienFleet()
+fleet.add_row(100000, color='green', points=5, spacing=20)
+print("Number of aliens in the fleet:", len(fleet))
+
+# Change the first three aliens to yellow, and move everyone down a row.
+fleet.recolor('yellow', lambda points, x, y: x < 60)
+fleet.move(dy=20)
+
+for alien in fleet[2:4]:
+    print(alien)
+print("Total points:", fleet.total_points())
+
+# ==> Comparing memory and build time <==
+# The tracemalloc module reports how much memory was allocated while a block
+# of code ran. Add 1000000 or 10000000 to 'sizes' to compare a million or
+# ten million aliens; the list of dictionaries needs several gigabytes of
+# memory for ten million.
+import time
+import tracemalloc
+
+
+def build_alien_dicts(num_aliens):
+    """Build aliens the way the million aliens example does."""
+    aliens = []
+    for alien_num in range(num_aliens):
+        alien = {
+            'color': 'green',
+            'points': 5,
+            'x': 20 * alien_num,
+            'y': 0
+        }
+        aliens.append(alien)
+    return aliens
+
+
+def build_alien_fleet(num_aliens):
+    """Build the same aliens in an AlienFleet."""
+    fleet = AlienFleet()
+    fleet.add_row(num_aliens, color='green', points=5, spacing=20)
+    return fleet
+
+
+def measure(build, num_aliens):
+    """Return the seconds and bytes needed to build num_aliens aliens."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(num_aliens)
+    seconds = time.perf_counter() - start
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return seconds, size
+
+sizes = [100000]
+for num_aliens in sizes:
+    for build in build_alien_dicts, build_alien_fleet:
+        seconds, size = measure(build, num_aliens)
+        print(f"{build.__name__}({num_aliens}): {seconds:.2f}s, "
+              f"{size / num_aliens:.1f} bytes per alien")
+
+######################################################################################
+## Finding aliens by position
+######################################################################################
+# Questions like "which aliens are near this point?" need a loop over every
+# alien when the aliens are only stored in a list. A spatial index splits the
+# screen into a grid of square cells, and uses a dictionary to map each cell
+# to the aliens inside it. A query only has to look at the few cells that
+# overlap the area it's interested in.
+
+# ==> A uniform grid of aliens <==
+import math
+
+
+class AlienGrid():
+    """Index alien positions in a grid of square cells."""
+
+    def __init__(self, cell_size=40):
+        """Start with an empty grid."""
+        self.cell_size = cell_size
+        # (column, row) -> set of alien ids, and alien id -> (x, y).
+        self.cells = {}
+        self.positions = {}
+
+    @classmethod
+    def from_aliens(cls, aliens, cell_size=40):
+        """Build a grid from aliens that have 'x' and 'y' keys, using
+        each alien's position in 'aliens' as its id."""
+        grid = cls(cell_size)
+        for alien_id, alien in enumerate(aliens):
+            grid.insert(alien_id, alien['x'], alien['y'])
+        return grid
+
+    def cell(self, x, y):
+        """Return the cell that holds the point x, y."""
+        return (math.floor(x / self.cell_size),
+                math.floor(y / self.cell_size))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def insert(self, alien_id, x, y):
+        """Add an alien to the grid."""
+        if alien_id in self.positions:
+            raise KeyError(f"alien {alien_id!r} is already in the grid")
+        self.positions[alien_id] = (x, y)
+        self.cells.setdefault(self.cell(x, y), set()).add(alien_id)
+
+    def remove(self, alien_id):
+        """Remove an alien from the grid."""
+        x, y = self.positions.pop(alien_id)
+        cell = self.cell(x, y)
+        self.cells[cell].discard(alien_id)
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    def move(self, alien_id, x, y):
+        """Move an alien, changing cells only when it crosses a border."""
+        old_cell = self.cell(*self.positions[alien_id])
+        new_cell = self.cell(x, y)
+        self.positions[alien_id] = (x, y)
+        if new_cell != old_cell:
+            self.cells[old_cell].discard(alien_id)
+            if not self.cells[old_cell]:
+                del self.cells[old_cell]
+            self.cells.setdefault(new_cell, set()).add(alien_id)
+
+    def in_rect(self, left, top, right, bottom):
+        """Return the ids of the aliens inside a rectangle."""
+        first_col, first_row = self.cell(left, top)
+        last_col, last_row = self.cell(right, bottom)
+        num_cells = (last_col - first_col + 1) * (last_row - first_row + 1)
+
+        # A huge rectangle is cheaper to answer from the occupied cells.
+        if num_cells > len(self.cells):
+            cells = [cell for cell in self.cells
+                     if first_col <= cell[0] <= last_col
+                     and first_row <= cell[1] <= last_row]
+        else:
+            cells = [(col, row)
+                     for col in range(first_col, last_col + 1)
+                     for row in range(first_row, last_row + 1)]
+
+        found = []
+        for cell in cells:
+            for alien_id in self.cells.get(cell, ()):
+                x, y = self.positions[alien_id]
+                if left <= x <= right and top <= y <= bottom:
+                    found.append(alien_id)
+        return found
+
+    def in_radius(self, x, y, radius):
+        """Return the ids of the aliens within radius of x, y."""
+        limit = radius * radius
+        found = []
+        for alien_id in self.in_rect(x - radius, y - radius,
+                                     x + radius, y + radius):
+            alien_x, alien_y = self.positions[alien_id]
+            if (alien_x - x) ** 2 + (alien_y - y) ** 2 <= limit:
+                found.append(alien_id)
+        return found
+
+    def nearest(self, x, y):
+        """Return the id of the alien closest to x, y, or None."""
+        if not self.positions:
+            return None
+
+        col, row = self.cell(x, y)
+        best_id, best_dist = None, math.inf
+        ring = 0
+        while True:
+            # Once a ring has more cells than the grid has occupied cells,
+            # looking at every occupied cell is faster.
+            if 8 * ring > len(self.cells):
+                cells = self.cells
+            elif ring == 0:
+                cells = [(col, row)]
+            else:
+                cells = [(c, r)
+                         for c in range(col - ring, col + ring + 1)
+                         for r in (row - ring, row + ring)]
+                cells += [(c, r)
+                          for c in (col - ring, col + ring)
+                          for r in range(row - ring + 1, row + ring)]
+
+            for cell in cells:
+                for alien_id in self.cells.get(cell, ()):
+                    alien_x, alien_y = self.positions[alien_id]
+                    dist = math.hypot(alien_x - x, alien_y - y)
+                    if dist < best_dist:
+                        best_id, best_dist = alien_id, dist
+
+            # Nothing outside this ring can be closer than ring cells away.
+            if cells is self.cells or best_dist <= ring * self.cell_size:
+                return best_id
+            ring += 1
+
+    def collisions(self, distance):
+        """Yield each pair of alien ids that are within distance of each
+        other, looking only at neighboring cells."""
+        reach = max(1, math.ceil(distance / self.cell_size))
+        # Only look "forward" so each pair of cells is checked once.
+        offsets = [(dc, dr)
+                   for dc in range(-reach, reach + 1)
+                   for dr in range(0, reach + 1)
+                   if dr > 0 or dc > 0]
+        limit = distance * distance
+
+        for (col, row), members in self.cells.items():
+            members = list(members)
+            for i, first in enumerate(members):
+                first_x, first_y = self.positions[first]
+                for second in members[i + 1:]:
+                    second_x, second_y = self.positions[second]
+                    if ((first_x - second_x) ** 2
+                            + (first_y - second_y) ** 2 <= limit):
+                        yield first, second
+
+            for dc, dr in offsets:
+                neighbors = self.cells.get((col + dc, row + dr))
+                if not neighbors:
+                    continue
+                for first in members:
+                    first_x, first_y = self.positions[first]
+                    for second in neighbors:
+                        second_x, second_y = self.positions[second]
+                        if ((first_x - second_x) ** 2
+                                + (first_y - second_y) ** 2 <= limit):
+                            yield first, second
+
+# ==> Asking where the aliens are <==
+# Ten rows of a thousand aliens each.
+aliens = []
+for row in range(10):
+    for alien_num in range(1000):
+        alien = {'color': 'green', 'points': 5,
+                 'x': 20 * alien_num, 'y': 30 * row}
+        aliens.append(alien)
+
+grid = AlienGrid.from_aliens(aliens, cell_size=40)
+
+print("Aliens near (100, 0):", sorted(grid.in_radius(100, 0, 25)))
+print("Aliens in the top left corner:", len(grid.in_rect(0, 0, 99, 59)))
+print("Alien closest to (5003, 47):", grid.nearest(5003, 47))
+
+# ==> Updating the grid as aliens move <==
+# Move the first alien onto its neighbor, and look for collisions.
+grid.move(0, 18, 0)
+aliens[0]['x'] = 18
+print("Colliding aliens:", list(grid.collisions(5)))
+
+######################################################################################
+## Saving aliens to a binary snapshot
+######################################################################################
+# Generating a million aliens every time a program starts takes a while. You
+# can save them once to a binary file where every alien is a fixed-width
+# record, and memory-map the file when you need the aliens again. Mapping a
+# file doesn't read it; the operating system only loads the parts of the file
+# you actually touch, so you can jump straight to any alien by its index.
+
+# ==> The snapshot file format <==
+# header:  magic b'ALNS', version, number of colors, number of aliens
+# records: color code, points, x, y for each alien (32 bytes each)
+# colors:  one 16 byte name for each color code, after the records
+# Points, x and y are 64-bit integers, like the columns of an AlienFleet.
+import mmap
+import os
+import struct
+
+SNAPSHOT_MAGIC = b'ALNS'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct('<4sHHQ')
+ALIEN_RECORD = struct.Struct('<B7xqqq')
+COLOR_NAME = struct.Struct('16s')
+
+
+def save_aliens(filename, aliens, chunk_size=65536):
+    """Save aliens (dictionaries or an AlienFleet) to a snapshot file, and
+    return the number of aliens saved."""
+    colors = {}
+    num_aliens = 0
+    chunk = bytearray(ALIEN_RECORD.size * chunk_size)
+    used = 0
+
+    with open(filename, 'wb') as file_object:
+        # The header is written again once we know how many aliens there are.
+        file_object.write(bytes(SNAPSHOT_HEADER.size))
+
+        for alien in aliens:
+            code = colors.get(alien['color'])
+            if code is None:
+                # struct would cut longer names short without complaining.
+                name = alien['color'].encode('utf-8')
+                if len(name) > COLOR_NAME.size:
+                    raise ValueError(f"color name {alien['color']!r} is "
+                                     f"longer than {COLOR_NAME.size} bytes")
+                code = colors[alien['color']] = len(colors)
+                if code > 255:
+                    raise ValueError("a snapshot can hold at most 256 colors")
+            ALIEN_RECORD.pack_into(chunk, used, code, alien['points'],
+                                   alien['x'], alien['y'])
+            used += ALIEN_RECORD.size
+            num_aliens += 1
+            if used == len(chunk):
+                file_object.write(chunk)
+                used = 0
+        file_object.write(chunk[:used])
+
+        for color in colors:
+            file_object.write(COLOR_NAME.pack(color.encode('utf-8')))
+
+        file_object.seek(0)
+        file_object.write(SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(colors), num_aliens))
+
+    return num_aliens
+
+
+class AlienSnapshot():
+    """Give read-only access to the aliens in a snapshot file."""
+
+    def __init__(self, filename):
+        """Map the file into memory and read its header and colors."""
+        with open(filename, 'rb') as file_object:
+            # mmap can't map an empty file, so check the size first.
+            if os.fstat(file_object.fileno()).st_size < SNAPSHOT_HEADER.size:
+                raise ValueError(f"{filename} is too short to be an alien "
+                                 f"snapshot")
+            self.data = mmap.mmap(file_object.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+
+        magic, version, num_colors, self.num_aliens = (
+            SNAPSHOT_HEADER.unpack_from(self.data))
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.data.close()
+            raise ValueError(f"{filename} is not an alien snapshot")
+
+        colors_start = (SNAPSHOT_HEADER.size
+                        + ALIEN_RECORD.size * self.num_aliens)
+        if len(self.data) < colors_start + COLOR_NAME.size * num_colors:
+            self.data.close()
+            raise ValueError(f"{filename} is a truncated alien snapshot")
+        self.colors = []
+        for code in range(num_colors):
+            name, = COLOR_NAME.unpack_from(
+                self.data, colors_start + COLOR_NAME.size * code)
+            self.colors.append(name.rstrip(b'\0').decode('utf-8'))
+
+    def __len__(self):
+        return self.num_aliens
+
+    def __getitem__(self, index):
+        """Return one alien as a dictionary, or a slice as a list."""
+        if isinstance(index, slice):
+            return list(self.iter_slice(index.start, index.stop, index.step))
+
+        if index < 0:
+            index += self.num_aliens
+        if not 0 <= index < self.num_aliens:
+            raise IndexError("alien index out of range")
+        offset = SNAPSHOT_HEADER.size + ALIEN_RECORD.size * index
+        code, points, x, y = ALIEN_RECORD.unpack_from(self.data, offset)
+        return {'color': self.colors[code], 'points': points, 'x': x, 'y': y}
+
+    def __iter__(self):
+        return self.iter_slice()
+
+    def iter_slice(self, start=None, stop=None, step=None):
+        """Yield the aliens in a slice, reading only the records needed."""
+        start, stop, step = slice(start, stop, step).indices(self.num_aliens)
+        if step != 1:
+            for index in range(start, stop, step):
+                yield self[index]
+            return
+
+        first = SNAPSHOT_HEADER.size + ALIEN_RECORD.size * start
+        last = SNAPSHOT_HEADER.size + ALIEN_RECORD.size * max(start, stop)
+        # Copy a block of records at a time. A memoryview of the file kept
+        # open across 'yield' would stop close() from unmapping it.
+        block_size = ALIEN_RECORD.size * 4096
+        for block_start in range(first, last, block_size):
+            records = self.data[block_start:min(block_start + block_size,
+                                                 last)]
+            for code, points, x, y in ALIEN_RECORD.iter_unpack(records):
+                yield {'color': self.colors[code], 'points': points,
+                       'x': x, 'y': y}
+
+    def load_fleet(self, start=None, stop=None):
+        """Load the aliens from start to stop into an AlienFleet."""
+        fleet = AlienFleet(self.colors)
+        for alien in self.iter_slice(start, stop):
+            fleet.append(**alien)
+        return fleet
+
+    def close(self):
+        """Unmap the file."""
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# ==> Saving and loading a hundred thousand aliens <==
+import os
+import tempfile
+
+aliens = AlienFleet()
+aliens.add_row(100000, color='green', points=5, spacing=20)
+for alien in aliens[:3]:
+    alien['color'] = 'yellow'
+
+filename = os.path.join(tempfile.gettempdir(), 'aliens.snapshot')
+num_saved = save_aliens(filename, aliens)
+print("Aliens saved:", num_saved, "-", os.path.getsize(filename), "bytes")
+
+with AlienSnapshot(filename) as snapshot:
+    print("Aliens in the snapshot:", len(snapshot))
+    print("The last alien:", snapshot[-1])
+    print("Aliens 2 to 4:", snapshot[2:5])
+
+    first_wave = snapshot.load_fleet(0, 1000)
+    print("Points in the first wave:", first_wave.total_points())
+
+os.remove(filename)
+
+# ==> Rejecting bad snapshots <==
+try:
+    save_aliens(filename, [{'color': 'iridescent turquoise', 'points': 5,
+                            'x': 0, 'y': 0}])
+except ValueError as exc:
+    print(exc)
+
+open(filename, 'wb').close()
+try:
+    AlienSnapshot(filename)
+except ValueError as exc:
+    print(exc)
+os.remove(filename)
+
+######################################################################################
+## Making aliens only when they're needed
+######################################################################################
+# The million aliens loop builds every alien before any of them is used. If
+# you only need to look at each alien once, a generator can make them as you
+# go instead. A generator uses 'yield' to hand out one value at a time, so
+# only the aliens you are working on take up memory.
+
+# ==> A lazy alien factory <==
+def make_green_alien(alien_num):
+    """Make the alien at position alien_num in the first row."""
+    return {'color': 'green', 'points': 5, 'x': 20 * alien_num, 'y': 0}
+
+
+class AlienFactory():
+    """Make aliens on demand instead of storing all of them."""
+
+    def __init__(self, num_aliens, make_alien=make_green_alien,
+                 chunk_size=10000):
+        """Describe the aliens without making any of them."""
+        self.num_aliens = num_aliens
+        self.make_alien = make_alien
+        self.chunk_size = chunk_size
+        # alien_num -> dictionary of the fields that were changed.
+        self.overrides = {}
+
+    def __len__(self):
+        return self.num_aliens
+
+    def override(self, alien_num, **changes):
+        """Remember changes to one alien, without making the others."""
+        if not 0 <= alien_num < self.num_aliens:
+            raise IndexError("alien index out of range")
+        self.overrides.setdefault(alien_num, {}).update(changes)
+
+    def __getitem__(self, index):
+        """Make one alien, or a list of aliens for a slice."""
+        if isinstance(index, slice):
+            return [self[alien_num]
+                    for alien_num in range(*index.indices(self.num_aliens))]
+
+        if index < 0:
+            index += self.num_aliens
+        if not 0 <= index < self.num_aliens:
+            raise IndexError("alien index out of range")
+        alien = self.make_alien(index)
+        if index in self.overrides:
+            alien.update(self.overrides[index])
+        return alien
+
+    def chunks(self):
+        """Yield the aliens as lists of at most chunk_size aliens."""
+        for start in range(0, self.num_aliens, self.chunk_size):
+            stop = min(start + self.chunk_size, self.num_aliens)
+            chunk = []
+            for alien_num in range(start, stop):
+                alien = self.make_alien(alien_num)
+                if alien_num in self.overrides:
+                    alien.update(self.overrides[alien_num])
+                chunk.append(alien)
+            yield chunk
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            yield from chunk
+
+# ==> Streaming over a hundred thousand aliens <==
+import tracemalloc
+
+aliens = AlienFactory(100000)
+
+# Change the first three aliens to yellow.
+for alien_num in range(3):
+    aliens.override(alien_num, color='yellow', points=10)
+
+print("Number of aliens:", len(aliens))
+print(aliens[0])
+print(aliens[-1])
+
+# Only one chunk of aliens exists at a time, so the most memory used while
+# we add up a hundred thousand aliens is about one chunk's worth. tracemalloc works
+# the same way on every operating system.
+tracemalloc.start()
+total_points = sum(alien['points'] for alien in aliens)
+size, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+
+print("Total points:", total_points)
+print("Peak memory while adding up:", peak // 1024, "KB")
+
+######################################################################################
+## Sharing the data that aliens have in common
+######################################################################################
+# Every alien in the million aliens example repeats 'color': 'green',
+# 'points': 5 and 'y': 0. Instead of storing these values a million times,
+# each alien can point to one shared template and only store the fields
+# where it differs from the template. When a field changes, the alien
+# records its own copy of that field and the template stays the same; this
+# is called copy-on-write.
+
+# ==> Aliens that share a template <==
+from types import MappingProxyType
+
+
+class TemplatedAlien(MutableMapping):
+    """A dictionary-like alien that stores only its differences from a
+    shared template."""
+
+    # __slots__ stops Python from giving every alien its own __dict__.
+    __slots__ = ('template', 'changes')
+
+    def __init__(self, template, **changes):
+        """Point at the template and store the changed fields."""
+        self.template = template
+        # Changes are stored flat, as (key, value, key, value, ...).
+        self.changes = ()
+        for key, value in changes.items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        changes = self.changes
+        for position in range(0, len(changes), 2):
+            if changes[position] == key:
+                return changes[position + 1]
+        return self.template[key]
+
+    def __setitem__(self, key, value):
+        changes = self.changes
+        for position in range(0, len(changes), 2):
+            if changes[position] == key:
+                changes = changes[:position] + changes[position + 2:]
+                break
+        if key not in self.template or self.template[key] != value:
+            changes += (key, value)
+        self.changes = changes
+
+    def __delitem__(self, key):
+        raise TypeError("fields can't be removed from a templated alien")
+
+    def __iter__(self):
+        yield from self.template
+        for key in self.changes[::2]:
+            if key not in self.template:
+                yield key
+
+    def __len__(self):
+        return len(self.template) + sum(
+            1 for key in self.changes[::2] if key not in self.template)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+# ==> A hundred thousand aliens with one template <==
+green_alien = MappingProxyType({'color': 'green', 'points': 5, 'x': 0,
+                                'y': 0})
+
+aliens = []
+for alien_num in range(100000):
+    aliens.append(TemplatedAlien(green_alien, x=20 * alien_num))
+
+# Change the first three aliens to yellow; the template doesn't change.
+for alien in aliens[:3]:
+    alien['color'] = 'yellow'
+    alien['points'] = 10
+
+print(aliens[0])
+print(aliens[3])
+print("Template:", dict(green_alien))
+
+# ==> Memory per alien <==
+import tracemalloc
+
+
+def bytes_per_alien(make_alien, num_aliens=100000):
+    """Return the average memory used by an alien made by make_alien."""
+    tracemalloc.start()
+    aliens = [make_alien(alien_num) for alien_num in range(num_aliens)]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del aliens
+    return size / num_aliens
+
+plain_size = bytes_per_alien(lambda alien_num: {
+    'color': 'green', 'points': 5, 'x': 20 * alien_num, 'y': 0})
+templated_size = bytes_per_alien(
+    lambda alien_num: TemplatedAlien(green_alien, x=20 * alien_num))
+
+print(f"Plain dictionary: {plain_size:.0f} bytes per alien")
+print(f"Templated alien: {templated_size:.0f} bytes per alien")
+
+######################################################################################
+## A frozen lookup table for read-only dictionaries
+######################################################################################
+# Some dictionaries, like a table of capitals, never change after they're
+# built but are read millions of times. A perfect hash function sends every
+# key to its own slot in a table with exactly one slot per key, so a lookup
+# never has to deal with collisions. Storing all the keys and values in a few
+# large byte strings, instead of millions of small string objects, also lets
+# forked worker processes share the table: reading it never touches the
+# reference counts of the individual strings, so the memory pages are never
+# copied. Build the table before forking, because Python's string hashes
+# change from one interpreter to the next.
+
+# ==> Building a minimal perfect hash <==
+from array import array
+from collections.abc import Mapping
+
+
+class FrozenLookup(Mapping):
+    """A read-only string -> string table built on a minimal perfect hash."""
+
+    def __init__(self, mapping):
+        """Build the table once from a dictionary of strings."""
+        items = list(mapping.items())
+        self.size = len(items)
+        self.num_buckets = max(1, self.size // 2)
+
+        # Group the keys into buckets of about two keys each, using the
+        # ordinary hash function.
+        buckets = [[] for _ in range(self.num_buckets)]
+        for item in items:
+            buckets[hash(item[0]) % self.num_buckets].append(item)
+
+        # Place the biggest buckets first. For each bucket, find a seed that
+        # sends all of its keys to free slots; a bucket with a single key
+        # takes the next free slot directly, stored as a negative seed.
+        self.seeds = array('q', bytes(8 * self.num_buckets))
+        slots = [None] * self.size
+        free_slots = iter(range(self.size))
+        for bucket_num in sorted(range(self.num_buckets),
+                                 key=lambda num: -len(buckets[num])):
+            bucket = buckets[bucket_num]
+            if not bucket:
+                break
+            if len(bucket) == 1:
+                slot = next(slot for slot in free_slots
+                            if slots[slot] is None)
+                slots[slot] = bucket[0]
+                self.seeds[bucket_num] = -slot - 1
+                continue
+
+            seed = 1
+            while True:
+                positions = {hash((seed, key)) % self.size
+                             for key, value in bucket}
+                if (len(positions) == len(bucket)
+                        and all(slots[slot] is None for slot in positions)):
+                    break
+                seed += 1
+            for key, value in bucket:
+                slots[hash((seed, key)) % self.size] = (key, value)
+            self.seeds[bucket_num] = seed
+
+        # Keep the keys and values in two contiguous byte strings.
+        self.keys_data, self.key_offsets = self.pack(
+            key for key, value in slots)
+        self.values_data, self.value_offsets = self.pack(
+            value for key, value in slots)
+
+    @staticmethod
+    def pack(strings):
+        """Return the strings joined as UTF-8, and where each one starts."""
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = array('Q', [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        return b''.join(encoded), offsets
+
+    def slot(self, key):
+        """Return the slot that key would be stored in."""
+        seed = self.seeds[hash(key) % self.num_buckets]
+        if seed < 0:
+            return -seed - 1
+        return hash((seed, key)) % self.size
+
+    def get(self, key, default=None):
+        """Return the value for key, or default if key isn't in the table."""
+        if not self.size or not isinstance(key, str):
+            return default
+        try:
+            encoded = key.encode()
+        except UnicodeEncodeError:
+            # A string with lone surrogates can't have been stored.
+            return default
+        slot = self.slot(key)
+        offsets = self.key_offsets
+        # Keys that aren't in the table still land in some slot, so compare
+        # with the key that is stored there.
+        if self.keys_data[offsets[slot]:offsets[slot + 1]] != encoded:
+            return default
+        offsets = self.value_offsets
+        return self.values_data[offsets[slot]:offsets[slot + 1]].decode()
+
+    def get_many(self, keys, default=None):
+        """Return a list of the values for many keys at once.
+
+        The slots for the whole batch are found first, and then the stored
+        keys are compared and the values decoded in a single pass, without
+        a method call for each key.
+        """
+        keys = list(keys)
+        if not self.size:
+            return [default] * len(keys)
+
+        seeds, num_buckets, size = self.seeds, self.num_buckets, self.size
+        slots = []
+        for key in keys:
+            if not isinstance(key, str):
+                slots.append(-1)
+                continue
+            seed = seeds[hash(key) % num_buckets]
+            slots.append(-seed - 1 if seed < 0 else hash((seed, key)) % size)
+
+        keys_data, key_offsets = self.keys_data, self.key_offsets
+        values_data, value_offsets = self.values_data, self.value_offsets
+        values = []
+        for key, slot in zip(keys, slots):
+            if slot < 0:
+                values.append(default)
+                continue
+            try:
+                encoded = key.encode()
+            except UnicodeEncodeError:
+                values.append(default)
+                continue
+            if keys_data[key_offsets[slot]:key_offsets[slot + 1]] == encoded:
+                values.append(values_data[
+                    value_offsets[slot]:value_offsets[slot + 1]].decode())
+            else:
+                values.append(default)
+        return values
+
+    def __getitem__(self, key):
+        value = self.get(key, self)
+        if value is self:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, self) is not self
+
+    def __iter__(self):
+        offsets = self.key_offsets
+        for slot in range(self.size):
+            yield self.keys_data[offsets[slot]:offsets[slot + 1]].decode()
+
+    def __len__(self):
+        return self.size
+
+# ==> Looking up capitals <==
+capitals = {'mozambique': 'maputo', 'tanzania': 'dodoma',
+            'south africa': 'pretoria', 'rsa': 'pretoria', 'angola': 'luanda'}
+frozen_capitals = FrozenLookup(capitals)
+
+print(frozen_capitals['mozambique'])
+print(frozen_capitals.get('france', 'unknown'))
+print(frozen_capitals.get_many(['rsa', 'angola', 'malawi'], default='?'))
+print(frozen_capitals.get('\udc80', 'unknown'))    # a lone surrogate
+
+# ==> A table with 25,000 entries <==
+import time
+
+big_table = {f"country {num}": f"capital {num}" for num in range(25000)}
+
+start = time.perf_counter()
+frozen_table = FrozenLookup(big_table)
+print(f"Built {len(frozen_table)} entries in "
+      f"{time.perf_counter() - start:.2f} seconds")
+
+assert all(frozen_table[key] == value for key, value in big_table.items())
+print(frozen_table.get_many(['country 42', 'country 24999', 'atlantis']))
+
+######################################################################################
+## Looking up who uses a language
+######################################################################################
+# The fav_languages dictionary answers "which languages does jen use?", but
+# to answer "who uses python?" you have to loop through every person's list.
+# An inverted index is a second dictionary that maps each language to the
+# set of people who use it. If both dictionaries are updated together, each
+# question can be answered by looking up a key, and "who uses both python and
+# haskell?" is an intersection of two sets.
+
+# ==> An index that works in both directions <==
+class LanguageIndex():
+    """Keep person -> languages and language -> people in step."""
+
+    def __init__(self, fav_languages=None):
+        """Start with an optional dictionary of person -> languages."""
+        self.languages = {}
+        self.people = {}
+        if fav_languages:
+            for person, languages in fav_languages.items():
+                for language in languages:
+                    self.add(person, language)
+
+    def add(self, person, language):
+        """Record that person uses language."""
+        self.languages.setdefault(person, set()).add(language)
+        self.people.setdefault(language, set()).add(person)
+
+    def remove(self, person, language):
+        """Record that person no longer uses language."""
+        self.languages[person].remove(language)
+        self.people[language].remove(person)
+        # Drop empty sets so they don't pile up.
+        if not self.languages[person]:
+            del self.languages[person]
+        if not self.people[language]:
+            del self.people[language]
+
+    def remove_person(self, person):
+        """Forget everything about a person."""
+        for language in list(self.languages.get(person, ())):
+            self.remove(person, language)
+
+    def languages_of(self, person):
+        """Return the languages a person uses."""
+        return set(self.languages.get(person, ()))
+
+    def users_of(self, language):
+        """Return the people who use a language."""
+        return set(self.people.get(language, ()))
+
+    def users_of_all(self, *languages):
+        """Return the people who use every one of the languages."""
+        groups = sorted((self.people.get(language, set())
+                         for language in languages), key=len)
+        if not groups:
+            return set()
+        # Start from the smallest group, so the intersection stays small.
+        return groups[0].intersection(*groups[1:])
+
+    def users_of_any(self, *languages):
+        """Return the people who use at least one of the languages."""
+        return set().union(*(self.people.get(language, ())
+                             for language in languages))
+
+    def __len__(self):
+        return len(self.languages)
+
+# ==> Asking who uses python <==
+fav_languages = {
+    'jen': ['python', 'ruby'],
+    'sarah': ['c'],
+    'edward': ['ruby', 'go'],
+    'phil': ['python', 'haskell']
+}
+index = LanguageIndex(fav_languages)
+
+print("Python:", sorted(index.users_of('python')))
+print("Python and haskell:", sorted(index.users_of_all('python', 'haskell')))
+
+index.add('sarah', 'python')
+index.remove('phil', 'haskell')
+print("Python:", sorted(index.users_of('python')))
+print("Python or go:", sorted(index.users_of_any('python', 'go')))
+
+# ==> A hundred thousand people <==
+import random
+import time
+
+all_languages = ['python', 'c', 'ruby', 'go', 'haskell', 'rust', 'java',
+                 'c++', 'javascript', 'kotlin', 'ocaml', 'lua']
+random.seed(5)
+
+index = LanguageIndex()
+for person_num in range(100000):
+    for language in random.sample(all_languages, 2):
+        index.add(f"person {person_num}", language)
+
+start = time.perf_counter()
+both = index.users_of_all('ocaml', 'haskell')
+print(len(both), "people use ocaml and haskell, found in",
+      f"{time.perf_counter() - start:.3f} seconds")
+
+######################################################################################
+## Comparing people's languages with bits
+######################################################################################
+# Comparing two lists of languages means checking every language in one list
+# against every language in the other. If each language is given a number,
+# a person's languages can be stored as one integer where bit number n is
+# set when they use language n. Then the languages two people share are
+# 'a & b', the languages either one uses are 'a | b', and counting the set
+# bits with int.bit_count() tells you how many there are. Each of these is a
+# single operation, however many languages there are.
+
+# ==> Languages as bits <==
+import heapq
+from itertools import chain, combinations, product
+
+
+class LanguageBits():
+    """Store each person's languages as the bits of an integer."""
+
+    def __init__(self, fav_languages=None):
+        """Start with an optional dictionary of person -> languages."""
+        self.language_ids = {}
+        self.language_names = []
+        self.masks = {}
+        if fav_languages:
+            for person, languages in fav_languages.items():
+                self.add(person, languages)
+
+    def language_id(self, language):
+        """Return the number for a language, giving it one if it's new."""
+        if language not in self.language_ids:
+            self.language_ids[language] = len(self.language_names)
+            self.language_names.append(language)
+        return self.language_ids[language]
+
+    def add(self, person, languages):
+        """Record that person uses each of the languages."""
+        mask = self.masks.get(person, 0)
+        for language in languages:
+            mask |= 1 << self.language_id(language)
+        self.masks[person] = mask
+
+    def names(self, mask):
+        """Return the names of the languages set in mask."""
+        return [name for language_id, name in enumerate(self.language_names)
+                if mask >> language_id & 1]
+
+    def shared(self, first, second):
+        """Return the languages both people use."""
+        return self.names(self.masks[first] & self.masks[second])
+
+    def combined(self, first, second):
+        """Return the languages either person uses."""
+        return self.names(self.masks[first] | self.masks[second])
+
+    def similarity(self, first, second):
+        """Return the Jaccard similarity of two people's languages."""
+        return jaccard(self.masks[first], self.masks[second])
+
+    def most_similar(self, person, k=3):
+        """Return the k people whose languages are most like person's."""
+        mask = self.masks[person]
+        others = ((jaccard(mask, other_mask), other)
+                  for other, other_mask in self.masks.items()
+                  if other != person)
+        return [other for score, other in heapq.nlargest(k, others)]
+
+    def top_pairs(self, k=3):
+        """Return the k most similar pairs of people, as (score, first,
+        second) tuples."""
+        # People with exactly the same languages share one mask, so each
+        # pair of distinct masks only has to be scored once.
+        groups = {}
+        for person, mask in self.masks.items():
+            groups.setdefault(mask, []).append(person)
+
+        # Every pair of masks gives at least one pair of people, so only the
+        # k best pairs of masks are kept, instead of a list of all of them.
+        scored = chain(
+            ((jaccard(mask, mask), mask, mask)
+             for mask, people in groups.items() if len(people) > 1),
+            ((jaccard(first, second), first, second)
+             for first, second in combinations(groups, 2)))
+        scored = heapq.nlargest(k, scored, key=lambda item: item[0])
+
+        pairs = []
+        for score, first, second in scored:
+            if first == second:
+                people = combinations(groups[first], 2)
+            else:
+                people = product(groups[first], groups[second])
+            for pair in people:
+                pairs.append((score,) + pair)
+                if len(pairs) == k:
+                    return pairs
+        return pairs
+
+
+def jaccard(first_mask, second_mask):
+    """Return shared bits divided by combined bits."""
+    combined = (first_mask | second_mask).bit_count()
+    if not combined:
+        return 0.0
+    return (first_mask & second_mask).bit_count() / combined
+
+# ==> Finding similar people <==
+fav_languages = {
+    'jen': ['python', 'ruby'],
+    'sarah': ['c'],
+    'edward': ['ruby', 'go'],
+    'phil': ['python', 'haskell'],
+    'mario': ['c++', 'python', 'ruby'],
+}
+bits = LanguageBits(fav_languages)
+
+print("jen and mario share", bits.shared('jen', 'mario'))
+print("jen or phil use", bits.combined('jen', 'phil'))
+print("jen and mario similarity:", bits.similarity('jen', 'mario'))
+print("Most like jen:", bits.most_similar('jen', k=2))
+print("Most similar pairs:", bits.top_pairs(k=2))
+
+# ==> Comparing with lists of languages <==
+import random
+import time
+
+
+def list_jaccard(first, second):
+    """Return the Jaccard similarity of two lists of languages."""
+    shared = [language for language in first if language in second]
+    combined = first + [language for language in second
+                        if language not in first]
+    return len(shared) / len(combined)
+
+all_languages = ['python', 'c', 'ruby', 'go', 'haskell', 'rust', 'java',
+                 'c++', 'javascript', 'kotlin', 'ocaml', 'lua', 'perl',
+                 'swift', 'scala', 'elixir', 'erlang', 'fortran', 'cobol',
+                 'julia']
+random.seed(8)
+fav_languages = {f"person {num}": random.sample(all_languages, 6)
+                 for num in range(300)}
+bits = LanguageBits(fav_languages)
+masks = list(bits.masks.values())
+people = list(fav_languages.values())
+
+start = time.perf_counter()
+for first, second in combinations(people, 2):
+    list_jaccard(first, second)
+list_seconds = time.perf_counter() - start
+
+start = time.perf_counter()
+for first, second in combinations(masks, 2):
+    jaccard(first, second)
+bits_seconds = time.perf_counter() - start
+
+print(f"All pairs of {len(people)} people: lists {list_seconds:.2f}s, "
+      f"bits {bits_seconds:.2f}s")
+
+######################################################################################
+## Indexing a dictionary of dictionaries
+######################################################################################
+# The users dictionary is keyed by username, so finding the users who live in
+# paris means looping over every user. A secondary index is another
+# dictionary that maps a field's value, such as a location, to the usernames
+# that have that value. For usernames that start with some prefix you can use
+# a trie: a tree of nested dictionaries with one level for each character.
+# Every index has to be updated whenever a user is added, changed or removed.
+
+# ==> A user directory with indexes <==
+class UserDirectory():
+    """Store users by username, with indexes on some of their fields."""
+
+    indexed_fields = ('location', 'last')
+
+    def __init__(self, users=None):
+        """Start with an optional dictionary of username -> user info."""
+        self.users = {}
+        # field -> value -> set of usernames.
+        self.indexes = {field: {} for field in self.indexed_fields}
+        # Each trie node is a dictionary of character -> child node. The
+        # key None marks the end of a username.
+        self.trie = {}
+        if users:
+            for username, user_dict in users.items():
+                self.insert(username, user_dict)
+
+    def insert(self, username, user_dict):
+        """Add a new user with a dictionary of their information."""
+        if username in self.users:
+            raise KeyError(f"user {username!r} already exists")
+        # Keep a copy, so changing the caller's dictionary can't get the
+        # indexes out of step.
+        user_dict = dict(user_dict)
+        self.users[username] = user_dict
+        for field in self.indexed_fields:
+            if field in user_dict:
+                self.index_add(field, user_dict[field], username)
+
+        node = self.trie
+        for char in username:
+            node = node.setdefault(char, {})
+        node[None] = True
+
+    def update(self, username, changes):
+        """Change some of a user's fields, given as a dictionary."""
+        user_dict = self.users[username]
+        for field, value in changes.items():
+            if field in self.indexes:
+                if field in user_dict:
+                    self.index_remove(field, user_dict[field], username)
+                self.index_add(field, value, username)
+            user_dict[field] = value
+
+    def delete(self, username):
+        """Remove a user and take them out of every index."""
+        user_dict = self.users.pop(username)
+        for field in self.indexed_fields:
+            if field in user_dict:
+                self.index_remove(field, user_dict[field], username)
+
+        # Walk down the trie, then prune the nodes nobody else uses.
+        path = [self.trie]
+        for char in username:
+            path.append(path[-1][char])
+        del path[-1][None]
+        for char, parent in zip(reversed(username), reversed(path[:-1])):
+            if parent[char]:
+                break
+            del parent[char]
+
+    def index_add(self, field, value, username):
+        """Add username to the index for field."""
+        self.indexes[field].setdefault(value, set()).add(username)
+
+    def index_remove(self, field, value, username):
+        """Remove username from the index for field."""
+        usernames = self.indexes[field][value]
+        usernames.discard(username)
+        if not usernames:
+            del self.indexes[field][value]
+
+    def get(self, username, default=None):
+        """Return the information stored for a user."""
+        return self.users.get(username, default)
+
+    def find(self, field, value):
+        """Return the usernames whose field equals value."""
+        if field in self.indexes:
+            return set(self.indexes[field].get(value, ()))
+        # Fields without an index still work, with a full scan.
+        return {username for username, user_dict in self.users.items()
+                if user_dict.get(field) == value}
+
+    def in_location(self, location):
+        """Return the usernames of the users in a location."""
+        return self.find('location', location)
+
+    def with_prefix(self, prefix):
+        """Return the usernames that start with prefix, in sorted order."""
+        node = self.trie
+        for char in prefix:
+            if char not in node:
+                return []
+            node = node[char]
+
+        usernames = []
+        stack = [(prefix, node)]
+        while stack:
+            name, node = stack.pop()
+            if None in node:
+                usernames.append(name)
+            stack.extend((name + char, child)
+                         for char, child in node.items() if char is not None)
+        return sorted(usernames)
+
+    def __len__(self):
+        return len(self.users)
+
+    def __contains__(self, username):
+        return username in self.users
+
+# ==> Querying the directory <==
+users = {
+    'aeinstein': {'first': 'albert', 'last': 'einstein',
+                  'location': 'princeton'},
+    'mcurie': {'first': 'marie', 'last': 'curie', 'location': 'paris'},
+    'pcurie': {'first': 'pierre', 'last': 'curie', 'location': 'paris'},
+    'efermi': {'first': 'enrico', 'last': 'fermi', 'location': 'rome'},
+}
+directory = UserDirectory(users)
+
+print("In paris:", sorted(directory.in_location('paris')))
+print("Curies:", sorted(directory.find('last', 'curie')))
+print("Usernames starting with 'e':", directory.with_prefix('e'))
+
+directory.update('efermi', {'location': 'chicago'})
+directory.delete('pcurie')
+print("In paris:", sorted(directory.in_location('paris')))
+print("In chicago:", sorted(directory.in_location('chicago')))
+print("Usernames starting with 'p':", directory.with_prefix('p'))
+
+######################################################################################
+## A cache that forgets old values
+######################################################################################
+# An OrderedDict is often used as a cache: computed values are stored under
+# a key so they don't have to be computed again. Without a limit the cache
+# grows forever, so a real cache evicts something when it's full. An LRU
+# (least recently used) cache moves each key to the end whenever it's used
+# and evicts from the front. An LFU (least frequently used) cache counts how
+# often each key is used and evicts the key with the smallest count. Values
+# can also be given a time to live (TTL), after which they count as missing.
+
+# ==> A bounded cache built on OrderedDict <==
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+
+class Cache():
+    """A dictionary-like cache with a maximum size and an eviction policy."""
+
+    def __init__(self, max_size=128, policy='lru', ttl=None):
+        """Make an empty cache. ttl is a number of seconds, or None."""
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if policy not in ('lru', 'lfu'):
+            raise ValueError("policy must be 'lru' or 'lfu'")
+        self.max_size = max_size
+        self.policy = policy
+        self.ttl = ttl
+
+        # Keys are kept in order of use, the least recently used first.
+        self.data = OrderedDict()
+        # Expiry times, the soonest first: every key gets the same ttl, so
+        # moving a key to the end when it's stored keeps them in order.
+        self.expires = OrderedDict()
+        # For LFU: key -> use count, and use count -> keys with that count.
+        self.counts = {}
+        self.by_count = {}
+        self.min_count = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the value for key, or default if it's missing or expired."""
+        if key in self.data and self.is_expired(key):
+            self.discard(key)
+        if key not in self.data:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.touch(key)
+        return self.data[key]
+
+    def put(self, key, value):
+        """Store a value, evicting another entry if the cache is full."""
+        if key in self.data:
+            self.touch(key)
+        else:
+            # Expired entries shouldn't take up room.
+            self.remove_expired()
+            if len(self.data) >= self.max_size:
+                self.evict()
+            if self.policy == 'lfu':
+                self.counts[key] = 1
+                self.by_count.setdefault(1, OrderedDict())[key] = None
+                self.min_count = 1
+        self.data[key] = value
+        if self.ttl is not None:
+            self.expires[key] = time.monotonic() + self.ttl
+            self.expires.move_to_end(key)
+
+    def discard(self, key):
+        """Remove key from the cache if it's there."""
+        if key not in self.data:
+            return
+        del self.data[key]
+        self.expires.pop(key, None)
+        if self.policy == 'lfu':
+            count = self.counts.pop(key)
+            del self.by_count[count][key]
+            if not self.by_count[count]:
+                del self.by_count[count]
+
+    def remove_expired(self):
+        """Remove every entry that has outlived the cache's ttl."""
+        now = time.monotonic()
+        while self.expires:
+            key, expires = next(iter(self.expires.items()))
+            if expires > now:
+                break
+            self.discard(key)
+
+    def is_expired(self, key):
+        """Return True if key has outlived the cache's ttl."""
+        return key in self.expires and self.expires[key] <= time.monotonic()
+
+    def touch(self, key):
+        """Record that key was just used."""
+        self.data.move_to_end(key)
+        if self.policy == 'lfu':
+            count = self.counts[key]
+            del self.by_count[count][key]
+            if not self.by_count[count]:
+                del self.by_count[count]
+                if self.min_count == count:
+                    self.min_count = count + 1
+            self.counts[key] = count + 1
+            self.by_count.setdefault(count + 1, OrderedDict())[key] = None
+
+    def evict(self):
+        """Remove one entry to make room for a new one."""
+        if self.policy == 'lru':
+            key = next(iter(self.data))
+        else:
+            # A discarded key can leave min_count pointing at nothing.
+            if self.min_count not in self.by_count:
+                self.min_count = min(self.by_count)
+            key = next(iter(self.by_count[self.min_count]))
+        self.discard(key)
+        self.evictions += 1
+
+    def clear(self):
+        """Remove every entry, but keep the counters."""
+        self.data.clear()
+        self.expires.clear()
+        self.counts.clear()
+        self.by_count.clear()
+
+    def __getitem__(self, key):
+        value = self.get(key, self)
+        if value is self:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        if key not in self.data:
+            raise KeyError(key)
+        self.discard(key)
+
+    def __contains__(self, key):
+        return key in self.data and not self.is_expired(key)
+
+    def __len__(self):
+        self.remove_expired()
+        return len(self.data)
+
+    def __iter__(self):
+        """Iterate over a copy of the keys, the least recently used first,
+        without counting them as uses."""
+        return iter(self.keys())
+
+    def keys(self):
+        """Return the keys, the least recently used first."""
+        self.remove_expired()
+        return list(self.data.keys())
+
+    def items(self):
+        """Return the (key, value) pairs, the least recently used first."""
+        self.remove_expired()
+        return list(self.data.items())
+
+    def stats(self):
+        """Return the hit, miss and eviction counters."""
+        self.remove_expired()
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'size': len(self.data)}
+
+    def __call__(self, func):
+        """Use the cache as a decorator that remembers func's results."""
+        missing = object()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args
+            if kwargs:
+                key += (missing,) + tuple(sorted(kwargs.items()))
+            result = self.get(key, missing)
+            if result is missing:
+                result = func(*args, **kwargs)
+                self.put(key, result)
+            return result
+
+        wrapper.cache = self
+        return wrapper
+
+
+class ThreadSafeCache(Cache):
+    """A Cache that can be shared between threads."""
+
+    def __init__(self, max_size=128, policy='lru', ttl=None):
+        """Make an empty cache protected by a lock."""
+        super().__init__(max_size, policy, ttl)
+        self.lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            return super().get(key, default)
+
+    def put(self, key, value):
+        with self.lock:
+            super().put(key, value)
+
+    def discard(self, key):
+        with self.lock:
+            super().discard(key)
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+
+    def __delitem__(self, key):
+        with self.lock:
+            super().__delitem__(key)
+
+    def __contains__(self, key):
+        with self.lock:
+            return super().__contains__(key)
+
+    def __len__(self):
+        with self.lock:
+            return super().__len__()
+
+    def keys(self):
+        with self.lock:
+            return super().keys()
+
+    def items(self):
+        with self.lock:
+            return super().items()
+
+    def stats(self):
+        with self.lock:
+            return super().stats()
+
+# ==> Caching capitals <==
+capitals = Cache(max_size=2)
+
+capitals['mozambique'] = 'maputo'
+capitals['tanzania'] = 'dodoma'
+capitals.get('mozambique')
+capitals['angola'] = 'luanda'       # evicts tanzania, the least recently used
+
+print(capitals.items())
+print(capitals.get('tanzania', 'not cached'))
+print(capitals.stats())
+print(list(capitals))               # looping doesn't count as hits or misses
+
+# ==> Least frequently used <==
+capitals = Cache(max_size=2, policy='lfu')
+
+capitals['mozambique'] = 'maputo'
+capitals['tanzania'] = 'dodoma'
+capitals.get('tanzania')
+capitals.get('tanzania')
+capitals.get('mozambique')
+capitals['angola'] = 'luanda'       # evicts mozambique, used the fewest times
+
+print(capitals.keys())
+
+# ==> Using the cache as a decorator <==
+@ThreadSafeCache(max_size=100)
+def fibonacci(n):
+    """Return the nth Fibonacci number."""
+    if n < 2:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+
+print(fibonacci(80))
+print(fibonacci.cache.stats())
\ No newline at end of file
@@ -149,6 +149,99 @@ if players:
 else:
     print("We have no players yet!")
 
+######################################################################################
+## Reading piped input quickly
+######################################################################################
+# The "repeat it back" loops further down call input() and print() once for
+# every message. That's fine for a person typing, but when millions of lines
+# are piped into the program, each call does a little work of its own and
+# the loop becomes slow. When input isn't coming from a terminal, the program
+# can read the input in large chunks, split each chunk into lines in one
+# step, and write all the lines of a chunk back with a single write() call.
+# sys.stdin.isatty() tells you whether a person is typing.
+
+# The input() calls below read from sys.stdin, which keeps its own buffer,
+# so the chunked reader reads from sys.stdin too, instead of going around it
+# to sys.stdin.buffer. It only starts reading when the first fast loop needs
+# it, and it keeps any lines after that loop's 'quit' for the loops after it.
+# sys.stdin also turns Windows line endings into plain newlines.
+# Try it with:
+#   (echo Ann; echo 30; seq 1000000; yes quit | head -4) |
+#       python 4.control_statements.py
+import sys
+
+
+class PipedInput():
+    """Read lines from a text stream in large chunks."""
+
+    def __init__(self, stream, chunk_size=1 << 20):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.lines = []
+        self.position = 0
+        self.leftover = ''
+
+    def fill(self):
+        """Read chunks until there are whole lines to hand out. Return False
+        at the end of the input."""
+        while True:
+            chunk = self.stream.read(self.chunk_size)
+            if not chunk:
+                # The last line may not end with a newline.
+                if not self.leftover:
+                    return False
+                self.lines, self.leftover = [self.leftover], ''
+            else:
+                data = self.leftover + chunk
+                end = data.rfind('\n')
+                if end == -1:
+                    self.leftover = data
+                    continue
+                self.leftover = data[end + 1:]
+                self.lines = data[:end].split('\n')
+            self.position = 0
+            return True
+
+    def input(self, prompt=''):
+        """Print the prompt and return the next line, like input() does.
+        Raise EOFError at the end of the input."""
+        if self.position == len(self.lines) and not self.fill():
+            raise EOFError
+        sys.stdout.write(prompt)
+        line = self.lines[self.position]
+        self.position += 1
+        return line
+
+    def read_until(self, sentinel):
+        """Yield lists of lines up to, but not including, a line equal to
+        the sentinel. Lines after the sentinel are kept for later reads."""
+        while self.position < len(self.lines) or self.fill():
+            lines = self.lines[self.position:]
+            if sentinel not in lines:
+                self.position = len(self.lines)
+                yield lines
+                continue
+            stop = lines.index(sentinel)
+            self.position += stop + 1
+            if stop:
+                yield lines[:stop]
+            return
+
+
+def repeat_back_batch(source, stdout, sentinel='quit'):
+    """Copy lines from source to stdout until a line equals the sentinel,
+    writing whole chunks at a time. Return the number of lines written."""
+    written = 0
+    for lines in source.read_until(sentinel):
+        stdout.write('\n'.join(lines) + '\n')
+        written += len(lines)
+    stdout.flush()
+    return written
+
+# Check once whether the input is piped in. Once the chunked reader has
+# started, every later loop reads from it instead of calling input().
+piped_input = None if sys.stdin.isatty() else PipedInput(sys.stdin)
+
 ######################################################################################
 ## Accepting input
 ######################################################################################
@@ -171,8 +264,9 @@ else:
 # Accepting input in Python 2.7
 # Use raw_input() in Python 2.7. This function interprets all input as a
 # string, just as input() does in Python 3.
-name = raw_input("What's your name? ")
-print("Hello, " + name + ".")
+# (commented out, because raw_input() doesn't exist in Python 3)
+# name = raw_input("What's your name? ")
+# print("Hello, " + name + ".")
 
 ######################################################################################
 ## While loops
@@ -189,37 +283,46 @@ while current_number <= 5:
 prompt = "\nTell me something, and I'll repeat it back to you."
 prompt += "\nEnter 'quit' to quit the program. "
 
-message = ""
-while message != 'quit':
-    message = input(prompt)
+if piped_input:
+    repeat_back_batch(piped_input, sys.stdout)
+else:
+    message = ""
+    while message != 'quit':
+        message = input(prompt)
 
-    if message != 'quit':
-        print(message)
+        if message != 'quit':
+            print(message)
 
 # Using a flag
 prompt = "\nTell me something, and I'll repeat it back to you."
 prompt += "\nEnter 'quit' to quit the program. "
 
-active = True
-while active:
-    message = input(prompt)
+if piped_input:
+    repeat_back_batch(piped_input, sys.stdout)
+else:
+    active = True
+    while active:
+        message = input(prompt)
 
-    if message == 'quit':
-        active = False
-    else:
-        print(message)
+        if message == 'quit':
+            active = False
+        else:
+            print(message)
 
 # Using a break to exit a loop
 prompt = "\nTell me something, and I'll repeat it back to you."
 prompt += "\nEnter 'quit' to quit the program. "
 
-while True:
-    message = input(prompt)
+if piped_input:
+    repeat_back_batch(piped_input, sys.stdout)
+else:
+    while True:
+        message = input(prompt)
 
-    if message == 'quit':
-        break
-    else:
-        print(message)
+        if message == 'quit':
+            break
+        else:
+            print(message)
 
 ######################################################################################
 ## Breaking out of loops
@@ -237,7 +340,10 @@ prompt += "\nEnter 'quit' when you're done. "
 
 players = []
 while True:
-    player = input(prompt)
+    if piped_input:
+        player = piped_input.input(prompt)
+    else:
+        player = input(prompt)
     if player == 'quit':
         break
     elif player in banned_players:
@@ -257,10 +363,10 @@ for player in players:
 # forever. If there's no way for the condition to become False, the loop will
 # never stop running.
 
-# An infinite loop
-while True:
-    name = input("\nWho are you?")
-    print("Nice to meet you," + name)
+# An infinite loop (commented out, so the rest of the file can run)
+# while True:
+#     name = input("\nWho are you?")
+#     print("Nice to meet you," + name)
 
 ######################################################################################
 ## Removing all instances of a value from a list
@@ -276,4 +382,562 @@ print(pets)
 while 'cat' in pets:
     pets.remove('cat')
 
-print(pets)
\ No newline at end of file
+print(pets)
+
+######################################################################################
+## Removing values in a single pass
+######################################################################################
+# The while loop above searches the list from the start every time it checks
+# 'cat' in pets, and remove() searches again, so a long list with many cats
+# gets searched over and over. You can remove everything in one pass instead:
+# walk through the list once, move each item you want to keep forward, and
+# cut off the leftover items at the end.
+
+# Removing all instances of several values in one pass
+def remove_all(items, values):
+    """Remove every item that's in values, in place, and return how many
+    items were removed. A single string counts as one value."""
+    # Make a list first, so an iterator of values is only read once.
+    values = [values] if isinstance(values, str) else list(values)
+    try:
+        lookup = set(values)
+    except TypeError:
+        # Unhashable values still work, with slower membership tests.
+        lookup = values
+
+    keep = 0
+    for item in items:
+        try:
+            found = item in lookup
+        except TypeError:
+            # An unhashable item can't be looked up in a set, but it can
+            # still be compared with each value.
+            found = item in values
+        if not found:
+            items[keep] = item
+            keep += 1
+    removed = len(items) - keep
+    del items[keep:]
+    return removed
+
+pets = ['dog', 'cat', 'dog', 'fish', 'cat', 'rabbit', 'cat']
+print(remove_all(pets, 'cat'), "cats removed")
+print(pets)
+
+# Counting values with a multiset
+# If you mostly ask "how many cats are there?" or remove every cat at once,
+# store a count for each value instead of the individual items. Values are
+# kept in the order they were first added.
+class Multiset():
+    """Count how many times each value was added."""
+
+    def __init__(self, items=()):
+        """Count the items in an optional iterable."""
+        self.counts = {}
+        self.total = 0
+        for item in items:
+            self.add(item)
+
+    def add(self, item, times=1):
+        """Add item one or more times."""
+        if times < 1:
+            raise ValueError("times must be at least 1")
+        self.counts[item] = self.counts.get(item, 0) + times
+        self.total += times
+
+    def remove(self, item):
+        """Remove one instance of item."""
+        if item not in self.counts:
+            raise ValueError(f"{item!r} is not in the multiset")
+        self.counts[item] -= 1
+        self.total -= 1
+        if not self.counts[item]:
+            del self.counts[item]
+
+    def remove_all(self, item):
+        """Remove every instance of item and return how many there were."""
+        removed = self.counts.pop(item, 0)
+        self.total -= removed
+        return removed
+
+    def count(self, item):
+        """Return how many times item is in the multiset."""
+        return self.counts.get(item, 0)
+
+    def __contains__(self, item):
+        return item in self.counts
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        for item, count in self.counts.items():
+            for _ in range(count):
+                yield item
+
+    def __repr__(self):
+        return f"Multiset({self.counts!r})"
+
+pets = Multiset(['dog', 'cat', 'dog', 'fish', 'cat', 'rabbit', 'cat'])
+print("There are", pets.count('cat'), "cats")
+
+pets.remove_all('cat')
+print(pets, len(pets), "pets")
+
+# Comparing the while loop with a single pass
+import time
+
+pets = ['dog', 'cat', 'fish', 'rabbit'] * 5000
+
+pets_copy = pets[:]
+start = time.perf_counter()
+while 'cat' in pets_copy:
+    pets_copy.remove('cat')
+loop_seconds = time.perf_counter() - start
+
+pets_copy = pets[:]
+start = time.perf_counter()
+remove_all(pets_copy, 'cat')
+single_pass_seconds = time.perf_counter() - start
+
+print(f"20,000 pets: while loop {loop_seconds:.3f}s, "
+      f"remove_all() {single_pass_seconds:.4f}s")
+
+######################################################################################
+## Checking a long list of banned users
+######################################################################################
+# 'user not in banned_users' looks at every name in the list until it finds
+# a match, so it gets slower as the list grows. A set finds a name with one
+# hash lookup, however many names it holds.
+#
+# A Bloom filter is a compact array of bits that can answer "definitely not
+# banned" or "maybe banned". It can be put in front of a set that is slow to
+# reach, like one stored on disk or on another server, so most names never
+# touch the set at all. For a set held in memory the set alone is already
+# fast, so the filter is optional.
+#
+# The ban list can be reloaded while other threads are reading it: the new
+# names are loaded on the side, and then a single assignment swaps them in.
+# Readers take one reference to the current names per call, so they never
+# see a half-loaded list and never wait for a lock.
+
+# Building a Bloom filter
+import math
+
+class BloomFilter():
+    """A set of bits that can tell you a name was never added."""
+
+    def __init__(self, expected_items, false_positive_rate=0.01):
+        """Size the filter for a number of items and an error rate."""
+        expected_items = max(expected_items, 1)
+        self.num_bits = math.ceil(-expected_items * math.log(
+            false_positive_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(
+            self.num_bits / expected_items * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def positions(self, item):
+        """Return the bit positions for an item (double hashing)."""
+        first = hash(item)
+        second = hash((item, 'bloom')) | 1
+        return [(first + i * second) % self.num_bits
+                for i in range(self.num_hashes)]
+
+    def add(self, item):
+        """Set the bits for an item."""
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        """Return False if item was never added, True if it may have been."""
+        bits = self.bits
+        return all(bits[position >> 3] >> (position & 7) & 1
+                   for position in self.positions(item))
+
+# A ban list backed by a set
+class BanList():
+    """Check names against a set of banned users."""
+
+    def __init__(self, names=(), use_bloom=False, false_positive_rate=0.01):
+        """Load the banned names, with an optional Bloom filter in front."""
+        self.use_bloom = use_bloom
+        self.false_positive_rate = false_positive_rate
+        self.state = self.build(names)
+
+    def build(self, names):
+        """Return a (set, Bloom filter or None) pair for names."""
+        banned = set(names)
+        bloom = None
+        if self.use_bloom:
+            bloom = BloomFilter(len(banned), self.false_positive_rate)
+            for name in banned:
+                bloom.add(name)
+        return banned, bloom
+
+    @staticmethod
+    def read_names(filename):
+        """Yield the non-empty lines of a file, one name per line."""
+        with open(filename, encoding='utf-8') as file_object:
+            for line in file_object:
+                name = line.strip()
+                if name:
+                    yield name
+
+    @classmethod
+    def from_file(cls, filename, use_bloom=False, false_positive_rate=0.01):
+        """Load a ban list from a file with one name per line."""
+        return cls(cls.read_names(filename), use_bloom, false_positive_rate)
+
+    def reload(self, names):
+        """Replace the banned names without blocking readers."""
+        # Build everything first, then swap it in with one assignment.
+        self.state = self.build(names)
+
+    def reload_file(self, filename):
+        """Replace the banned names with the names in a file."""
+        self.reload(self.read_names(filename))
+
+    def __contains__(self, name):
+        banned, bloom = self.state
+        if bloom is not None and name not in bloom:
+            return False
+        return name in banned
+
+    def contains_many(self, names):
+        """Return a list of True/False values, one for each name."""
+        banned, bloom = self.state
+        if bloom is None:
+            return [name in banned for name in names]
+        return [name in bloom and name in banned for name in names]
+
+    def __len__(self):
+        return len(self.state[0])
+
+banned_users = BanList(['ann', 'chad', 'dee'], use_bloom=True)
+user = 'erin'
+
+if user not in banned_users:
+    print("You can play!")
+
+print(banned_users.contains_many(['ann', 'erin', 'dee']))
+
+# Loading and reloading a ban list from a file
+import os
+import tempfile
+
+filename = os.path.join(tempfile.gettempdir(), 'banned_players.txt')
+with open(filename, 'w', encoding='utf-8') as file_object:
+    file_object.write("reinildo\ntico tico\nmadeira\n")
+
+banned_players = BanList.from_file(filename)
+print('messi' in banned_players, len(banned_players))
+
+with open(filename, 'a', encoding='utf-8') as file_object:
+    file_object.write("messi\ncristiano ronaldo\n")
+banned_players.reload_file(filename)
+print('messi' in banned_players, len(banned_players))
+os.remove(filename)
+
+######################################################################################
+## Turning an if-elif-else chain into a table
+######################################################################################
+# The if-elif-else chain that prices tickets by age checks each condition in
+# turn. With dozens of tiers that's dozens of comparisons for every ticket,
+# and a mistake in the order of the conditions is easy to miss. The same
+# rules can be stored as a sorted table of (upper bound, price) pairs; the
+# 'bisect' module then finds the right tier by halving the table, and the
+# table can check that the tiers make sense when it's built.
+
+# Building a tier table
+import math
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TierTable():
+    """Look up a price from (upper_bound, price) tiers."""
+
+    def __init__(self, tiers):
+        """Build the table. Each tier covers values up to and including
+        its upper bound; the last tier may use None for "everything else".
+        """
+        tiers = list(tiers)
+        if not tiers:
+            raise ValueError("a tier table needs at least one tier")
+
+        self.bounds = []
+        self.prices = []
+        for position, (bound, price) in enumerate(tiers):
+            if bound is None:
+                if position != len(tiers) - 1:
+                    raise ValueError("only the last tier can have no "
+                                     "upper bound")
+                bound = math.inf
+            elif self.bounds and bound <= self.bounds[-1]:
+                raise ValueError(f"tier bound {bound} overlaps the tier "
+                                 f"before it ({self.bounds[-1]}); bounds "
+                                 "must be in increasing order")
+            self.bounds.append(bound)
+            self.prices.append(price)
+
+    def price(self, value):
+        """Return the price for one value."""
+        position = bisect_left(self.bounds, value)
+        if position == len(self.bounds):
+            raise ValueError(f"{value} is above the highest tier")
+        return self.prices[position]
+
+    def price_many(self, values):
+        """Return the prices for many values as an array of floats."""
+        if np is not None:
+            if isinstance(values, np.ndarray) or hasattr(values, '__len__'):
+                values = np.asarray(values, dtype=float)
+            else:
+                # np.asarray() would turn a generator into a single object.
+                values = np.fromiter(values, dtype=float)
+            bounds = np.array(self.bounds, dtype=float)
+            positions = np.searchsorted(bounds, values, side='left')
+            if len(positions) and positions.max() == len(self.bounds):
+                raise ValueError("a value is above the highest tier")
+            prices = np.array(self.prices, dtype=float)[positions]
+            return array('d', prices.tobytes())
+        return array('d', (self.price(value) for value in values))
+
+ticket_prices = TierTable([(4, 0), (18, 5), (None, 10)])
+
+age = 12
+price = ticket_prices.price(age)
+print("Your cost is $" + str(price) + ".")
+
+print(ticket_prices.price_many([2, 4, 5, 18, 19, 65]))
+
+# Rejecting tiers that overlap
+try:
+    TierTable([(18, 5), (4, 0), (None, 10)])
+except ValueError as exc:
+    print(exc)
+
+######################################################################################
+## Repeating messages back over the network
+######################################################################################
+# The same "repeat it back" loop can serve many people at once over a
+# network connection. The 'asyncio' module runs one coroutine per
+# connection; while one connection is waiting for a message, the others
+# keep running. Each message is one line, and sending 'quit' closes the
+# connection, just like the loop above.
+#
+# If a client sends faster than it reads, its replies pile up in memory.
+# 'await writer.drain()' pauses that connection until its replies have been
+# sent, which is called backpressure. The server also refuses connections
+# past a maximum with a "server busy" reply, closes connections that send a
+# line longer than its limit, and counts messages and how long each one
+# took, from reading the line to sending the reply.
+
+# An asyncio echo server
+import asyncio
+import statistics
+import time
+from collections import deque
+
+BUSY_REPLY = b"server busy\n"
+TOO_LONG_REPLY = b"line too long\n"
+
+
+class ServerBusy(ConnectionError):
+    """The server turned the connection away."""
+
+
+class EchoStats():
+    """Count messages and keep recent latencies."""
+
+    def __init__(self, max_samples=100000):
+        """Start counting now."""
+        self.started = time.perf_counter()
+        self.messages = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=max_samples)
+
+    def record(self, seconds):
+        """Record one message that took a number of seconds."""
+        self.messages += 1
+        self.latencies.append(seconds)
+
+    def messages_per_second(self):
+        """Return the average number of messages per second so far."""
+        elapsed = time.perf_counter() - self.started
+        return self.messages / elapsed if elapsed else 0.0
+
+    def percentile(self, percent):
+        """Return a latency percentile in seconds, such as 50 or 99."""
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100)[percent - 1]
+
+    def summary(self):
+        """Return the counters as a dictionary."""
+        return {'messages': self.messages,
+                'rejected': self.rejected,
+                'messages_per_second': round(self.messages_per_second()),
+                'p50_ms': round(self.percentile(50) * 1000, 3),
+                'p99_ms': round(self.percentile(99) * 1000, 3)}
+
+
+class EchoServer():
+    """Repeat each line back to the client until it sends 'quit'."""
+
+    def __init__(self, max_connections=1000, sentinel=b'quit',
+                 write_buffer_limit=65536, line_limit=65536):
+        """Set the limits; call start() or start_unix() to listen."""
+        self.max_connections = max_connections
+        self.sentinel = sentinel
+        self.write_buffer_limit = write_buffer_limit
+        # The longest line a client may send, in bytes.
+        self.line_limit = line_limit
+        self.connections = 0
+        self.stats = EchoStats()
+        self.server = None
+
+    async def handle(self, reader, writer):
+        """Serve one connection."""
+        if self.connections >= self.max_connections:
+            self.stats.rejected += 1
+            await self.reply_and_close(reader, writer, BUSY_REPLY)
+            return
+
+        self.connections += 1
+        writer.transport.set_write_buffer_limits(high=self.write_buffer_limit)
+        try:
+            while True:
+                line = await reader.readline()
+                start = time.perf_counter()
+                if not line or line.rstrip(b'\r\n') == self.sentinel:
+                    break
+                writer.write(line)
+                # Wait here if the client isn't reading its replies.
+                await writer.drain()
+                self.stats.record(time.perf_counter() - start)
+        except ValueError:
+            # readline() raises ValueError for a line longer than the limit.
+            await self.reply_and_close(reader, writer, TOO_LONG_REPLY)
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def reply_and_close(self, reader, writer, reply, timeout=1.0):
+        """Send a last reply, such as BUSY_REPLY, and close the
+        connection."""
+        try:
+            writer.write(reply)
+            writer.write_eof()
+            # Closing a socket with unread messages resets the connection,
+            # which can throw away the reply before the client reads it. So
+            # read until the client hangs up, or the timeout runs out.
+            async with asyncio.timeout(timeout):
+                while await reader.read(65536):
+                    pass
+        except (ConnectionError, TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8888):
+        """Listen on a TCP port; port 0 picks a free one."""
+        self.server = await asyncio.start_server(self.handle, host, port,
+                                                 limit=self.line_limit)
+        return self.server.sockets[0].getsockname()
+
+    async def start_unix(self, path):
+        """Listen on a Unix socket."""
+        self.server = await asyncio.start_unix_server(self.handle, path,
+                                                      limit=self.line_limit)
+        return path
+
+    async def stop(self):
+        """Stop listening and close the server."""
+        self.server.close()
+        await self.server.wait_closed()
+
+# A load generator
+async def run_client(host, port, num_messages, stats, window=32):
+    """Send messages and read the replies, keeping up to 'window' messages
+    in flight, and record each round trip in stats. Return False if the
+    server was too busy to serve this client."""
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at = deque()
+    in_flight = asyncio.Semaphore(window)
+
+    async def send_messages():
+        for num in range(num_messages):
+            await in_flight.acquire()
+            sent_at.append(time.perf_counter())
+            writer.write(b"message %d\n" % num)
+            await writer.drain()
+
+    async def read_replies():
+        for _ in range(num_messages):
+            reply = await reader.readline()
+            if reply == BUSY_REPLY:
+                raise ServerBusy("the server is busy")
+            if not reply:
+                raise ConnectionError("the server closed the connection")
+            stats.record(time.perf_counter() - sent_at.popleft())
+            in_flight.release()
+
+    sender = asyncio.create_task(send_messages())
+    replies = asyncio.create_task(read_replies())
+    try:
+        # Reading stops once every message is answered, or as soon as the
+        # connection fails, so wait for the replies first.
+        await replies
+        await sender
+        writer.write(b"quit\n")
+        await writer.drain()
+        return True
+    except ServerBusy:
+        stats.rejected += 1
+        return False
+    finally:
+        sender.cancel()
+        replies.cancel()
+        # Collect both tasks' exceptions so neither one goes unretrieved.
+        await asyncio.gather(sender, replies, return_exceptions=True)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def load_test(host, port, num_clients=100, num_messages=1000):
+    """Run many clients at once and return their combined stats, including
+    how many clients the server turned away."""
+    stats = EchoStats()
+    await asyncio.gather(*(run_client(host, port, num_messages, stats)
+                           for _ in range(num_clients)))
+    return stats
+
+
+async def benchmark_echo_server(num_clients=100, num_messages=200,
+                                max_connections=None):
+    """Start a server on a free local port and put it under load."""
+    server = EchoServer(max_connections=max_connections or num_clients)
+    host, port = await server.start('127.0.0.1', 0)
+    try:
+        client_stats = await load_test(host, port, num_clients, num_messages)
+    finally:
+        await server.stop()
+    print("Clients saw:", client_stats.summary())
+    print("Server saw:", server.stats.summary())
+
+asyncio.run(benchmark_echo_server())
+
+# Turning clients away when the server is full
+asyncio.run(benchmark_echo_server(num_clients=4, num_messages=50,
+                                  max_connections=2))
\ No newline at end of file